@@ -0,0 +1,52 @@
+"""add full-text search column and trigram index for /news search
+
+Revision ID: 0d5a7c3e9b12
+Revises: f60c1b8d3e49
+Create Date: 2026-10-18 12:41:05.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0d5a7c3e9b12'
+down_revision: Union[str, None] = 'f60c1b8d3e49'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SEARCH_TSV_SQL = (
+    "setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(snippet, '')), 'B') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(summary, '')), 'C')"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Generated + stored: filled for existing rows by the table rewrite, kept in sync by Postgres
+    op.add_column(
+        "content_items",
+        sa.Column("search_tsv", postgresql.TSVECTOR(), sa.Computed(SEARCH_TSV_SQL, persisted=True), nullable=True),
+    )
+    op.create_index("ix_content_items_search_tsv", "content_items", ["search_tsv"], unique=False, postgresql_using="gin")
+    op.create_index(
+        "ix_content_items_title_trgm",
+        "content_items",
+        ["title"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"title": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_content_items_title_trgm", table_name="content_items")
+    op.drop_index("ix_content_items_search_tsv", table_name="content_items")
+    op.drop_column("content_items", "search_tsv")
@@ -0,0 +1,43 @@
+"""add feed_cache + not_modified counters on ingest_runs
+
+Revision ID: 5b8e2f4c1d07
+Revises: 9c01b2d7a111
+Create Date: 2026-10-18 09:12:44.301822
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8e2f4c1d07'
+down_revision: Union[str, None] = '9c01b2d7a111'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "feed_cache",
+        sa.Column("url", sa.String(length=600), nullable=False),
+        sa.Column("etag", sa.String(length=300), nullable=True),
+        sa.Column("last_modified", sa.String(length=100), nullable=True),
+        sa.Column("body_hash", sa.String(length=64), nullable=True),
+        sa.Column("last_status", sa.Integer(), nullable=True),
+        sa.Column("checked_at", sa.DateTime(), nullable=False),
+        sa.Column("changed_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("url"),
+    )
+
+    op.add_column("ingest_runs", sa.Column("not_modified_count", sa.Integer(), server_default=sa.text("0"), nullable=False))
+    op.add_column("ingest_runs", sa.Column("unchanged_count", sa.Integer(), server_default=sa.text("0"), nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("ingest_runs", "unchanged_count")
+    op.drop_column("ingest_runs", "not_modified_count")
+    op.drop_table("feed_cache")
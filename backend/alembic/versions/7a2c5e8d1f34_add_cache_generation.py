@@ -0,0 +1,36 @@
+"""add cache_generation counter for response cache invalidation
+
+Revision ID: 7a2c5e8d1f34
+Revises: 0d5a7c3e9b12
+Create Date: 2026-10-18 13:22:47.905316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a2c5e8d1f34'
+down_revision: Union[str, None] = '0d5a7c3e9b12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "cache_generation",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("generation", sa.BigInteger(), server_default=sa.text("0"), nullable=False),
+        sa.Column("bumped_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    # the single row app.cache reads / ingestion bumps
+    op.execute("INSERT INTO cache_generation (id, generation) VALUES (1, 0)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("cache_generation")
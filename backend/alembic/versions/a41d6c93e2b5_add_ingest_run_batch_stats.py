@@ -0,0 +1,31 @@
+"""add skipped_count + batch_stats to ingest_runs
+
+Revision ID: a41d6c93e2b5
+Revises: 5b8e2f4c1d07
+Create Date: 2026-10-18 10:02:17.118406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41d6c93e2b5'
+down_revision: Union[str, None] = '5b8e2f4c1d07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("ingest_runs", sa.Column("skipped_count", sa.Integer(), server_default=sa.text("0"), nullable=False))
+    op.add_column("ingest_runs", sa.Column("batch_stats", postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("ingest_runs", "batch_stats")
+    op.drop_column("ingest_runs", "skipped_count")
@@ -0,0 +1,46 @@
+"""add content_stats rollup for meta endpoints
+
+Revision ID: b3e8d1a6c920
+Revises: 7a2c5e8d1f34
+Create Date: 2026-10-18 13:58:30.271946
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e8d1a6c920'
+down_revision: Union[str, None] = '7a2c5e8d1f34'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "content_stats",
+        sa.Column("kind", sa.String(length=10), nullable=False),
+        sa.Column("key", sa.String(length=80), nullable=False),
+        sa.Column("count", sa.BigInteger(), server_default=sa.text("0"), nullable=False),
+        sa.Column("last_published_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("kind", "key"),
+    )
+    # seed from the existing rows; ingestion keeps it current from here on
+    op.execute(
+        """
+        INSERT INTO content_stats (kind, key, count, last_published_at)
+        SELECT 'sport', sport, count(*), max(published_at) FROM content_items GROUP BY sport
+        UNION ALL
+        SELECT 'source', source, count(*), max(published_at) FROM content_items GROUP BY source
+        UNION ALL
+        SELECT 'all', '*', count(*), max(published_at) FROM content_items
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("content_stats")
@@ -0,0 +1,62 @@
+"""add rank_base / rank_key / urgency_bump for query-time rank decay
+
+Revision ID: c7f3a9e05d21
+Revises: a41d6c93e2b5
+Create Date: 2026-10-18 10:41:05.772913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7f3a9e05d21'
+down_revision: Union[str, None] = 'a41d6c93e2b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copies of the enrich.py constants at the time of this migration
+RANK_DECAY_PER_HOUR = 1.0 / 48.0 + 0.6 / 24.0
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("content_items", sa.Column("rank_base", sa.Float(), nullable=True))
+    op.add_column("content_items", sa.Column("rank_key", sa.Float(), nullable=True))
+    op.add_column("content_items", sa.Column("urgency_bump", sa.Float(), server_default=sa.text("0"), nullable=False))
+
+    # Backfill existing rows from what is already stored (topics, source_tier, is_duplicate)
+    op.execute(
+        """
+        UPDATE content_items SET urgency_bump =
+              (CASE WHEN 'injury' = ANY(coalesce(topics, '{}')) THEN 0.15 ELSE 0 END)
+            + (CASE WHEN 'trade' = ANY(coalesce(topics, '{}')) THEN 0.15 ELSE 0 END)
+            + (CASE WHEN 'suspension' = ANY(coalesce(topics, '{}')) THEN 0.10 ELSE 0 END)
+        """
+    )
+    op.execute(
+        """
+        UPDATE content_items SET rank_base =
+              1.0
+            + (CASE source_tier WHEN 1 THEN 0.25 WHEN 2 THEN 0.10 ELSE 0 END)
+            + (1.0 + urgency_bump) * 0.6
+            - (CASE WHEN coalesce(is_duplicate, false) THEN 0.35 ELSE 0 END)
+        """
+    )
+    op.execute(
+        f"UPDATE content_items SET rank_key = rank_base + {RANK_DECAY_PER_HOUR!r} * extract(epoch from published_at) / 3600.0"
+    )
+
+    op.alter_column("content_items", "rank_base", nullable=False)
+    op.alter_column("content_items", "rank_key", nullable=False)
+    op.create_index("ix_content_items_rank_key", "content_items", ["rank_key"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_content_items_rank_key", table_name="content_items")
+    op.drop_column("content_items", "urgency_bump")
+    op.drop_column("content_items", "rank_key")
+    op.drop_column("content_items", "rank_base")
@@ -0,0 +1,38 @@
+"""add backfill_checkpoints for resumable backfills
+
+Revision ID: d9f4b2c7e615
+Revises: b3e8d1a6c920
+Create Date: 2026-10-18 14:37:12.660183
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9f4b2c7e615'
+down_revision: Union[str, None] = 'b3e8d1a6c920'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "backfill_checkpoints",
+        sa.Column("name", sa.String(length=80), nullable=False),
+        sa.Column("last_id", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.Column("scanned", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.Column("updated", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("backfill_checkpoints")
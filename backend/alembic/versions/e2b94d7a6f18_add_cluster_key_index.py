@@ -0,0 +1,32 @@
+"""add expression index on the feed cluster key
+
+Revision ID: e2b94d7a6f18
+Revises: c7f3a9e05d21
+Create Date: 2026-10-18 11:20:39.584120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b94d7a6f18'
+down_revision: Union[str, None] = 'c7f3a9e05d21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Must match feed._group_key() exactly as SQLAlchemy renders it, or the planner won't use it
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_content_items_cluster_key "
+        "ON content_items ((coalesce(dedupe_group_id, CAST(id AS VARCHAR))))"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS ix_content_items_cluster_key")
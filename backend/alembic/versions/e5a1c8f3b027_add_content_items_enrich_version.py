@@ -0,0 +1,33 @@
+"""add content_items.enrich_version for re-enrichment
+
+Revision ID: e5a1c8f3b027
+Revises: d9f4b2c7e615
+Create Date: 2026-10-18 15:21:48.204517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a1c8f3b027'
+down_revision: Union[str, None] = 'd9f4b2c7e615'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # constant default: metadata-only on Postgres 11+, no table rewrite.
+    # Existing rows get 0 (unknown rule version), so the first reenrich run refreshes them.
+    op.add_column(
+        "content_items",
+        sa.Column("enrich_version", sa.Integer(), server_default=sa.text("0"), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("content_items", "enrich_version")
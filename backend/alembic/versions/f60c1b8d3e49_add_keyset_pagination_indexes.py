@@ -0,0 +1,38 @@
+"""add composite indexes for keyset pagination
+
+Revision ID: f60c1b8d3e49
+Revises: e2b94d7a6f18
+Create Date: 2026-10-18 11:58:12.440671
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f60c1b8d3e49'
+down_revision: Union[str, None] = 'e2b94d7a6f18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # /feed/top, /feed/breaking: ORDER BY rank_key DESC, published_at DESC, id DESC (backward scan)
+    op.create_index("ix_content_items_rank_keyset", "content_items", ["rank_key", "published_at", "id"], unique=False)
+    # /news: ORDER BY published_at DESC, id DESC
+    op.create_index("ix_content_items_published_at_id", "content_items", ["published_at", "id"], unique=False)
+    # /social/top: NULLS LAST needs the direction baked into the index
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_social_rank_keyset "
+        "ON social_posts (rank_score DESC NULLS LAST, created_at DESC, id DESC)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS ix_social_rank_keyset")
+    op.drop_index("ix_content_items_published_at_id", table_name="content_items")
+    op.drop_index("ix_content_items_rank_keyset", table_name="content_items")
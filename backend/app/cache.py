@@ -0,0 +1,288 @@
+"""
+In-process response cache for hot read endpoints (/feed/top, /feed/breaking, /meta/sports).
+
+- keyed on the endpoint name + its normalized query params (FastAPI has already applied
+  defaults, so "/feed/top" and "/feed/top?limit=50" share an entry)
+- bounded LRU (RESPONSE_CACHE_MAX_ENTRIES) with a TTL (RESPONSE_CACHE_TTL_SECONDS); the TTL
+  bounds how stale the time-dependent parts (live rank / urgency, "5m ago") can get
+- invalidated by a generation counter stored in the DB (cache_generation). Ingestion bumps it
+  in the same transaction that commits new rows, so every API process sees the change on its
+  next request; entries cached under an older generation are treated as misses
+- single-flight: concurrent misses for the same key wait for one computation instead of all
+  running the query (no stampede when a hot entry expires)
+
+Routes opt in with @cached_response("name"); the db session is read from the route kwargs.
+Both sync routes (Session) and async routes (AsyncSession) are supported.
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .models import CacheGeneration
+from .responses import dumps, json_response
+from .settings import settings
+
+CACHE_GENERATION_ID = 1
+
+
+def _generation_stmt():
+    return sa.select(CacheGeneration.generation).where(CacheGeneration.id == CACHE_GENERATION_ID)
+
+
+def current_generation(db: Session) -> int:
+    return int(db.execute(_generation_stmt()).scalar() or 0)
+
+
+async def current_generation_async(db: AsyncSession) -> int:
+    return int((await db.execute(_generation_stmt())).scalar() or 0)
+
+
+def bump_generation(db: Session) -> None:
+    """Invalidate every cached response. Call inside the transaction that changes content."""
+    db.execute(
+        sa.update(CacheGeneration)
+        .where(CacheGeneration.id == CACHE_GENERATION_ID)
+        .values(generation=CacheGeneration.generation + 1, bumped_at=datetime.utcnow())
+    )
+
+
+def _normalize(value: Any) -> Hashable:
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize(v) for v in value)
+    return value
+
+
+def cache_key(name: str, params: Dict[str, Any]) -> Tuple:
+    return (name,) + tuple(sorted((k, _normalize(v)) for k, v in params.items() if v is not None))
+
+
+@dataclass
+class _Entry:
+    value: Any
+    generation: int
+    expires_at: float
+
+
+@dataclass
+class _Flight:
+    done: threading.Event = field(default_factory=threading.Event)
+    value: Any = None
+    failed: bool = False
+
+
+@dataclass
+class _AsyncFlight:
+    done: asyncio.Event = field(default_factory=asyncio.Event)
+    value: Any = None
+    failed: bool = False
+
+
+class ResponseCache:
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple, _Entry]" = OrderedDict()
+        self._flights: Dict[Tuple, _Flight] = {}
+        self._async_flights: Dict[Tuple, _AsyncFlight] = {}  # async routes (all on the event loop)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0  # misses that waited on another request's computation
+        self.expired = 0
+        self.invalidated = 0  # entries dropped because the generation moved
+        self.evictions = 0
+        self.generation: Optional[int] = None  # last generation seen
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    _MISS = object()
+
+    def _lookup(self, key: Tuple, generation: int) -> Any:
+        """Fresh cached value or _MISS (drops stale entries). Caller holds the lock."""
+        self.generation = generation
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.generation == generation and entry.expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.value
+            if entry.generation != generation:
+                self.invalidated += 1
+            else:
+                self.expired += 1
+            del self._entries[key]
+        return self._MISS
+
+    def _store(self, key: Tuple, generation: int, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = _Entry(value, generation, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key: Tuple, generation: int, compute: Callable[[], Any]) -> Any:
+        if not self.enabled:
+            return compute()
+
+        flight_key = key + (generation,)
+        with self._lock:
+            value = self._lookup(key, generation)
+            if value is not self._MISS:
+                return value
+
+            flight = self._flights.get(flight_key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[flight_key] = _Flight()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if not flight.failed:
+                return flight.value
+            return compute()  # the leader raised; don't hand its error to everyone
+
+        try:
+            value = compute()
+        except BaseException:
+            flight.failed = True
+            raise
+        else:
+            flight.value = value
+            self._store(key, generation, value)
+            return value
+        finally:
+            with self._lock:
+                self._flights.pop(flight_key, None)
+            flight.done.set()
+
+    async def get_or_compute_async(self, key: Tuple, generation: int, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """get_or_compute for async routes: waiting requests yield to the event loop instead of blocking a thread."""
+        if not self.enabled:
+            return await compute()
+
+        flight_key = key + (generation,)
+        with self._lock:
+            value = self._lookup(key, generation)
+            if value is not self._MISS:
+                return value
+
+            flight = self._async_flights.get(flight_key)
+            leader = flight is None
+            if leader:
+                flight = self._async_flights[flight_key] = _AsyncFlight()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            await flight.done.wait()
+            if not flight.failed:
+                return flight.value
+            return await compute()
+
+        try:
+            value = await compute()
+        except BaseException:
+            flight.failed = True
+            raise
+        else:
+            flight.value = value
+            self._store(key, generation, value)
+            return value
+        finally:
+            with self._lock:
+                self._async_flights.pop(flight_key, None)
+            flight.done.set()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "generation": self.generation,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "expired": self.expired,
+                "invalidated": self.invalidated,
+                "evictions": self.evictions,
+                "hit_ratio": round((self.hits + self.coalesced) / lookups, 4) if lookups else None,
+            }
+
+
+response_cache = ResponseCache(
+    max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+)
+
+
+def cached_response(name: str):
+    """
+    Cache a route's return value in response_cache.
+    The route must take `db` (Session or AsyncSession); every other argument is part of the key.
+    Routes that also take `response: Response` (the card endpoints) have their payload rendered
+    once with responses.dumps(): the cache holds the JSON bytes, and every request gets them back
+    via json_response() with its own headers (ETag, ...).
+    """
+
+    def decorator(fn):
+        def _key(kwargs):
+            return cache_key(name, {k: v for k, v in kwargs.items() if k not in ("db", "response")})
+
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                db = kwargs["db"]
+                response = kwargs.get("response")
+                generation = await current_generation_async(db)
+
+                async def compute():
+                    value = await fn(*args, **kwargs)
+                    return dumps(value) if response is not None else value
+
+                value = await response_cache.get_or_compute_async(_key(kwargs), generation, compute)
+                return json_response(value, response) if response is not None else value
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            db = kwargs["db"]
+            response = kwargs.get("response")
+
+            def compute():
+                value = fn(*args, **kwargs)
+                return dumps(value) if response is not None else value
+
+            value = response_cache.get_or_compute(_key(kwargs), current_generation(db), compute)
+            return json_response(value, response) if response is not None else value
+
+        return wrapper
+
+    return decorator
@@ -1,16 +1,152 @@
-from sqlalchemy import create_engine
+from typing import Any, Dict, Iterable
+from uuid import uuid4
+
+import sqlalchemy as sa
+from sqlalchemy import create_engine, make_url
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from .pool_metrics import InstrumentedAsyncQueuePool, InstrumentedQueuePool
+from .replica import ReplicaLagMonitor, RoutingSession
 from .settings import settings
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+def _pool_kwargs() -> Dict[str, Any]:
+    return dict(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        # behind PgBouncer a "dead" server connection is PgBouncer's problem; skip the extra round trip
+        pool_pre_ping=not settings.DB_PGBOUNCER,
+    )
+
+
+def _set_local_statement_timeout(conn) -> None:
+    # transaction pooling: session settings would leak to other clients, so scope it to the transaction
+    conn.exec_driver_sql(f"SET LOCAL statement_timeout = {int(settings.DB_STATEMENT_TIMEOUT_MS)}")
+
+
+def _sync_connect_args() -> Dict[str, Any]:
+    if settings.DB_STATEMENT_TIMEOUT_MS > 0 and not settings.DB_PGBOUNCER:
+        return {"options": f"-c statement_timeout={int(settings.DB_STATEMENT_TIMEOUT_MS)}"}
+    return {}
+
+
+def _async_connect_args() -> Dict[str, Any]:
+    args: Dict[str, Any] = {}
+    if settings.DB_PGBOUNCER:
+        # PgBouncer (transaction pooling) can't keep named prepared statements on one backend:
+        # no statement caches, and unique names for the unnamed-statement fallback
+        args.update(
+            statement_cache_size=0,
+            prepared_statement_cache_size=0,
+            prepared_statement_name_func=lambda: f"__asyncpg_{uuid4()}__",
+        )
+    elif settings.DB_STATEMENT_TIMEOUT_MS > 0:
+        args["server_settings"] = {"statement_timeout": str(int(settings.DB_STATEMENT_TIMEOUT_MS))}
+    return args
+
+
+# Pool sizing is per engine and per process: each API worker can hold up to
+# 2 * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections (sync + async engine), to the primary
+# and, with READ_REPLICA_URL set, as many again to the replica.
+engine = create_engine(
+    settings.DATABASE_URL,
+    poolclass=InstrumentedQueuePool,
+    connect_args=_sync_connect_args(),
+    **_pool_kwargs(),
+)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
+
+def _asyncpg_url(url: str) -> str:
+    return make_url(url).set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+
+
+def async_database_url() -> str:
+    """ASYNC_DATABASE_URL, or DATABASE_URL with the driver swapped to asyncpg."""
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    return _asyncpg_url(settings.DATABASE_URL)
+
+
+# Read endpoints (feed/news/meta) run on the event loop with asyncpg; request concurrency is
+# then bounded by this pool instead of FastAPI's threadpool. Ingestion and scripts stay sync.
+async_engine = create_async_engine(
+    async_database_url(),
+    poolclass=InstrumentedAsyncQueuePool,
+    connect_args=_async_connect_args(),
+    **_pool_kwargs(),
+)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+# Optional read replica, same pool settings; None when READ_REPLICA_URL is unset
+replica_engine = None
+async_replica_engine = None
+if settings.READ_REPLICA_URL:
+    replica_engine = create_engine(
+        settings.READ_REPLICA_URL,
+        poolclass=InstrumentedQueuePool,
+        connect_args={**_sync_connect_args(), "connect_timeout": settings.REPLICA_CONNECT_TIMEOUT_SECONDS},
+        **_pool_kwargs(),
+    )
+    async_replica_engine = create_async_engine(
+        _asyncpg_url(settings.READ_REPLICA_URL),
+        poolclass=InstrumentedAsyncQueuePool,
+        connect_args={**_async_connect_args(), "timeout": settings.REPLICA_CONNECT_TIMEOUT_SECONDS},
+        **_pool_kwargs(),
+    )
+replica_lag = ReplicaLagMonitor(settings.REPLICA_MAX_LAG_SECONDS, settings.REPLICA_LAG_CHECK_SECONDS)
+
+# Sessions for read-only endpoints: primary-bound RoutingSessions that are handed the replica
+# as read_bind while it's within REPLICA_MAX_LAG_SECONDS (see get_read_db / get_async_read_db)
+ReadSessionLocal = sessionmaker(bind=engine, class_=RoutingSession, autoflush=False, autocommit=False)
+AsyncReadSessionLocal = async_sessionmaker(
+    bind=async_engine, sync_session_class=RoutingSession, autoflush=False, expire_on_commit=False
+)
+
+if settings.DB_PGBOUNCER and settings.DB_STATEMENT_TIMEOUT_MS > 0:
+    for _engine in (engine, async_engine.sync_engine, replica_engine, getattr(async_replica_engine, "sync_engine", None)):
+        if _engine is not None:
+            sa.event.listen(_engine, "begin", _set_local_statement_timeout)
+
+
 class Base(DeclarativeBase):
     pass
 
+# Request-scoped sessions for routes; the only place sessions are opened for a request
+# (except /social/bulk_add_stream, whose session has to outlive the handler)
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Read-only endpoints: replica reads while it is fresh enough, primary otherwise
+def get_read_db():
+    read_bind = replica_engine if replica_engine is not None and replica_lag.check(replica_engine) else None
+    db = ReadSessionLocal(read_bind=read_bind)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db():
+    read_bind = None
+    if async_replica_engine is not None and await replica_lag.check_async(async_replica_engine):
+        read_bind = async_replica_engine.sync_engine
+    async with AsyncReadSessionLocal(read_bind=read_bind) as db:
+        yield db
+
+
+def any_of(values: Iterable[str]):
+    """`col == any_of(xs)` -> `col = ANY(:array)`: one bind parameter no matter how many values."""
+    return sa.any_(sa.literal(list(values), postgresql.ARRAY(sa.Text)))
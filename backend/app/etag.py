@@ -0,0 +1,76 @@
+"""
+Weak ETag / If-None-Match support for read endpoints.
+
+    feed_etag = etag_dependency("feed", ContentItem, ContentItem.published_at, time_bucket_seconds=60)
+    app.include_router(feed_router, dependencies=[Depends(feed_etag)])
+
+The tag is derived from a cheap fingerprint of the backing table rather than the page itself:
+(max id, max timestamp, cache generation) in one index-only query, plus the request path and
+normalized query string. Anything that could change a page moves the fingerprint: inserts move
+max(id), ingestion/backfills bump the generation (app/cache.py). Endpoints whose output depends
+on the clock (live rank, "5m ago") also fold in a time bucket.
+
+On a match the dependency raises a 304 before the route runs, so nothing is queried or serialized.
+The dependency is async (AsyncSession via get_async_read_db); async routes share its session,
+so the tag and the page come from the same database (replica or primary).
+"""
+from __future__ import annotations
+
+import hashlib
+import time
+from typing import Any, Callable
+
+import sqlalchemy as sa
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .cache import CACHE_GENERATION_ID
+from .db import get_async_read_db
+from .models import CacheGeneration
+
+
+async def _fingerprint(db: AsyncSession, model: Any, timestamp_column: Any) -> tuple:
+    generation = (
+        sa.select(CacheGeneration.generation)
+        .where(CacheGeneration.id == CACHE_GENERATION_ID)
+        .scalar_subquery()
+    )
+    result = await db.execute(sa.select(sa.func.max(model.id), sa.func.max(timestamp_column), generation))
+    return tuple(result.one())
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    # weak comparison (RFC 9110 13.1.2): ignore W/ on both sides
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def etag_dependency(
+    scope: str,
+    model: Any,
+    timestamp_column: Any,
+    time_bucket_seconds: int = 0,
+) -> Callable[..., None]:
+    """
+    Build a FastAPI dependency that sets a weak ETag on GET responses and answers
+    If-None-Match hits with 304. Non-GET requests pass through untouched.
+    """
+
+    async def dependency(request: Request, response: Response, db: AsyncSession = Depends(get_async_read_db)) -> None:
+        if request.method not in ("GET", "HEAD"):
+            return
+
+        max_id, max_ts, generation = await _fingerprint(db, model, timestamp_column)
+        bucket = int(time.time() // time_bucket_seconds) if time_bucket_seconds > 0 else 0
+        query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+        raw = f"{scope}|{max_id}|{max_ts}|{generation}|{bucket}|{request.url.path}|{query}"
+        etag = 'W/"' + hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20] + '"'
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _matches(if_none_match, etag):
+            raise HTTPException(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+
+    return dependency
@@ -1,12 +1,32 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, FastAPI
+from .db import async_engine, async_replica_engine
+from .etag import etag_dependency
+from .models import ContentItem, SocialPost
+from .settings import settings
 from .routes.news import router as news_router
 from .routes.meta import router as meta_router
 from .routes.feed import router as feed_router
 from app.routes.social import router as social_router
 
+# Weak ETag + If-None-Match -> 304 for read routes (meta opts in per route: /health must stay live)
+feed_etag = etag_dependency("feed", ContentItem, ContentItem.published_at, settings.ETAG_TIME_BUCKET_SECONDS)
+news_etag = etag_dependency("news", ContentItem, ContentItem.published_at)
+social_etag = etag_dependency("social", SocialPost, SocialPost.created_at, settings.ETAG_TIME_BUCKET_SECONDS)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # asyncpg connections belong to the event loop that opened them; close them with it
+    await async_engine.dispose()
+    if async_replica_engine is not None:
+        await async_replica_engine.dispose()
+
 
-app = FastAPI(title="SportsHub API")
-app.include_router(news_router)
+app = FastAPI(title="SportsHub API", lifespan=lifespan)
+app.include_router(news_router, dependencies=[Depends(news_etag)])
 app.include_router(meta_router)
-app.include_router(feed_router)
-app.include_router(social_router)
\ No newline at end of file
+app.include_router(feed_router, dependencies=[Depends(feed_etag)])
+app.include_router(social_router, dependencies=[Depends(social_etag)])
@@ -1,5 +1,5 @@
 from sqlalchemy import String, DateTime, Text, Index
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.orm import Mapped, deferred, mapped_column
 from datetime import datetime
 from .db import Base
 from sqlalchemy import String, DateTime, Integer
@@ -23,7 +23,7 @@ class ContentItem(Base):
     published_at: Mapped[datetime] = mapped_column(DateTime, index=True)
 
     snippet: Mapped[str | None] = mapped_column(Text, nullable=True)
-    raw: Mapped[str | None] = mapped_column(Text, nullable=True)
+    raw: Mapped[str | None] = deferred(mapped_column(Text, nullable=True))  # never needed for reads
 
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
 
@@ -37,15 +37,46 @@ class ContentItem(Base):
     teams = sa.Column(postgresql.ARRAY(sa.Text()), nullable=True)
     entities = sa.Column(JSONB, nullable=True)  # {"teams":[...], "players":[...], "leagues":[...]}
     summary = sa.Column(sa.Text, nullable=True)
-    key_points = sa.Column(ARRAY(sa.Text), nullable=True)
+    key_points = deferred(sa.Column(ARRAY(sa.Text), nullable=True))
     confidence = sa.Column(sa.Float, nullable=True)
 
     source_tier = sa.Column(sa.Integer, nullable=True)
-    rank_score = sa.Column(sa.Float, nullable=True, index=True)
+    rank_score = sa.Column(sa.Float, nullable=True, index=True)  # snapshot at ingest time (see rank_key)
     is_duplicate = sa.Column(sa.Boolean, nullable=False, server_default=sa.text("false"))
 
+    # Query-time ranking (enrich.compute_rank_base / compute_rank_key):
+    # live rank = rank_key - RANK_DECAY_PER_HOUR * epoch_hours(now), so ORDER BY rank_key never goes stale
+    rank_base = sa.Column(sa.Float, nullable=False)
+    rank_key = sa.Column(sa.Float, nullable=False, index=True)
+    urgency_bump = sa.Column(sa.Float, nullable=False, server_default=sa.text("0"))  # topic part of urgency
+    # enrich.ENRICH_VERSION the topic/urgency/rank fields were computed with (0 = before versioning)
+    enrich_version = sa.Column(sa.Integer, nullable=False, server_default=sa.text("0"))
+
+    # /news?q= full-text search (services/search.py); maintained by Postgres, never written or loaded by the app
+    search_tsv = deferred(sa.Column(
+        postgresql.TSVECTOR,
+        sa.Computed(
+            "setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english'::regconfig, coalesce(snippet, '')), 'B') || "
+            "setweight(to_tsvector('english'::regconfig, coalesce(summary, '')), 'C')",
+            persisted=True,
+        ),
+        nullable=True,
+    ))
+
 
 Index("ix_content_sport_published", ContentItem.sport, ContentItem.published_at)
+# Keyset pagination: /feed/* order (rank_key, published_at, id) DESC, /news (published_at, id) DESC
+Index("ix_content_items_rank_keyset", ContentItem.rank_key, ContentItem.published_at, ContentItem.id)
+Index("ix_content_items_published_at_id", ContentItem.published_at, ContentItem.id)
+# /news?q=: full-text (GIN on search_tsv) and fuzzy title fallback (pg_trgm)
+Index("ix_content_items_search_tsv", ContentItem.search_tsv, postgresql_using="gin")
+Index(
+    "ix_content_items_title_trgm",
+    ContentItem.title,
+    postgresql_using="gin",
+    postgresql_ops={"title": "gin_trgm_ops"},
+)
 
 
 class IngestRun(Base):
@@ -58,9 +89,59 @@ class IngestRun(Base):
 
     status: Mapped[str] = mapped_column(String(20), default="running", index=True)  # running/success/failed
     inserted_count: Mapped[int] = mapped_column(Integer, default=0)
+    not_modified_count: Mapped[int] = mapped_column(Integer, default=0, server_default=sa.text("0"))  # feeds answered 304
+    unchanged_count: Mapped[int] = mapped_column(Integer, default=0, server_default=sa.text("0"))  # 200 but same body hash
+    skipped_count: Mapped[int] = mapped_column(Integer, default=0, server_default=sa.text("0"))  # ON CONFLICT skips
+    batch_stats = sa.Column(JSONB, nullable=True)  # [{"rows":..,"inserted":..,"skipped":..}, ...] per writer batch
 
     error: Mapped[str | None] = mapped_column(String(2000), nullable=True)
 
+class FeedCache(Base):
+    """Conditional-GET validators per feed URL (ETag / Last-Modified + body hash)."""
+    __tablename__ = "feed_cache"
+
+    url: Mapped[str] = mapped_column(String(600), primary_key=True)
+    etag: Mapped[str | None] = mapped_column(String(300), nullable=True)
+    last_modified: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    body_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)  # sha256 of the last parsed body
+
+    last_status: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    checked_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    changed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)  # last time the body was (re)parsed
+
+
+class ContentStat(Base):
+    """Rollup of content_items per sport / source ("all" = totals); see services/content_stats.py."""
+    __tablename__ = "content_stats"
+
+    kind: Mapped[str] = mapped_column(String(10), primary_key=True)  # "sport" | "source" | "all"
+    key: Mapped[str] = mapped_column(String(80), primary_key=True)
+    count: Mapped[int] = mapped_column(sa.BigInteger, default=0, server_default=sa.text("0"))
+    last_published_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+
+class BackfillCheckpoint(Base):
+    """Cursor of a resumable backfill job (services/backfill.py); one row per job name."""
+    __tablename__ = "backfill_checkpoints"
+
+    name: Mapped[str] = mapped_column(String(80), primary_key=True)
+    last_id: Mapped[int] = mapped_column(Integer, default=0, server_default=sa.text("0"))  # committed up to here
+    scanned: Mapped[int] = mapped_column(Integer, default=0, server_default=sa.text("0"))
+    updated: Mapped[int] = mapped_column(Integer, default=0, server_default=sa.text("0"))
+    started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    updated_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)  # NULL = in progress / paused
+
+
+class CacheGeneration(Base):
+    """Single-row counter bumped by ingestion on commit; invalidates app.cache.response_cache."""
+    __tablename__ = "cache_generation"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    generation: Mapped[int] = mapped_column(sa.BigInteger, default=0, server_default=sa.text("0"))
+    bumped_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+
 class SocialPost(Base):
     __tablename__ = "social_posts"
 
@@ -85,3 +166,10 @@ class SocialPost(Base):
 
 Index("ux_social_platform_post_id", SocialPost.platform, SocialPost.post_id, unique=True)
 Index("ix_social_platform_created_at", SocialPost.platform, SocialPost.created_at)
+# Keyset pagination for /social/top: rank_score DESC NULLS LAST, created_at DESC, id DESC
+Index(
+    "ix_social_rank_keyset",
+    SocialPost.rank_score.desc().nullslast(),
+    SocialPost.created_at.desc(),
+    SocialPost.id.desc(),
+)
@@ -0,0 +1,83 @@
+"""
+Newline-delimited JSON (NDJSON) helpers for streaming endpoints.
+
+- iter_lines() splits a request body stream into lines as chunks arrive, never buffering
+  more than one line (capped at max_line_bytes)
+- NDJSONResponse streams progress lines back while the request body is still being read
+
+Usage (see /social/bulk_add_stream):
+
+    async def body():
+        async for lineno, line in iter_lines(request.stream()):
+            ...
+            yield ndjson_line({...})
+
+    return NDJSONResponse(body())
+"""
+from __future__ import annotations
+
+import json
+from typing import Any, AsyncIterator, Optional, Tuple
+
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# 64 KiB is far above any single social post; anything longer is reported, not buffered
+MAX_LINE_BYTES = 64 * 1024
+
+
+async def iter_lines(
+    chunks: AsyncIterator[bytes], max_line_bytes: int = MAX_LINE_BYTES
+) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """
+    Yield (line number, line) for every non-blank line (1-based, counting blank ones).
+    A line longer than max_line_bytes is yielded as (lineno, None) and its bytes dropped.
+    """
+    buf = bytearray()
+    lineno = 0
+    overflow = False
+    async for chunk in chunks:
+        buf += chunk
+        while True:
+            nl = buf.find(b"\n")
+            if nl < 0:
+                break
+            lineno += 1
+            line = bytes(buf[:nl]).strip()
+            del buf[:nl + 1]
+            if overflow or len(line) > max_line_bytes:
+                overflow = False
+                yield lineno, None
+            elif line:
+                yield lineno, line
+        if len(buf) > max_line_bytes:
+            overflow = True
+            buf.clear()
+    if overflow:
+        yield lineno + 1, None
+    elif buf.strip():
+        yield lineno + 1, bytes(buf).strip()
+
+
+def ndjson_line(obj: Any) -> bytes:
+    return (json.dumps(obj, default=str, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+class NDJSONResponse(StreamingResponse):
+    """
+    StreamingResponse for generators that read the request body while responding.
+
+    Starlette's StreamingResponse (on ASGI servers older than spec 2.4) runs a task that
+    reads `receive` to watch for disconnects, which would swallow body chunks the generator
+    is waiting for. Here the generator is the only reader; a client disconnect surfaces
+    as ClientDisconnect from request.stream() and ends the generator.
+    """
+
+    media_type = NDJSON_MEDIA_TYPE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
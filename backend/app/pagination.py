@@ -0,0 +1,75 @@
+"""
+Opaque keyset ("cursor") pagination helpers.
+
+A cursor is the sort key of the last row on the previous page, JSON-encoded and
+base64url'd. The next page is `WHERE (sort key) < (cursor)` under the same
+ORDER BY, which a matching composite btree index serves as a range scan, so
+page N costs the same as page 1 (unlike OFFSET).
+"""
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+import math
+from datetime import datetime
+from typing import Any, List, Optional, Sequence
+
+import sqlalchemy as sa
+from fastapi import HTTPException
+
+
+def _jsonable(v: Any) -> Any:
+    return v.isoformat() if isinstance(v, datetime) else v
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([_jsonable(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], types: Sequence[type]) -> Optional[List[Any]]:
+    """
+    Decode a cursor into values of the given types (float / int / datetime / str).
+    Returns None when no cursor was passed; a malformed cursor is a 400.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("wrong arity")
+        out: List[Any] = []
+        for v, t in zip(values, types):
+            if v is None:
+                out.append(None)
+            elif t is datetime:
+                out.append(datetime.fromisoformat(v))
+            else:
+                v = t(v)
+                # json.loads accepts NaN / Infinity (and 1e999); none of them is a real sort key
+                if isinstance(v, float) and not math.isfinite(v):
+                    raise ValueError("non-finite number")
+                out.append(v)
+        return out
+    except (ValueError, TypeError, OverflowError, binascii.Error, UnicodeError):
+        raise HTTPException(status_code=400, detail="invalid_cursor")
+
+
+def keyset_before(columns: Sequence[Any], values: Sequence[Any], nullable_first: bool = False):
+    """
+    Rows strictly after `values` in `ORDER BY col1 DESC, col2 DESC, ...`.
+
+    With nullable_first=True the first column is treated as `DESC NULLS LAST`
+    (NULLs form one block after every non-NULL value).
+    """
+    cols = list(columns)
+    vals = [sa.literal(v, c.type) for c, v in zip(cols, values)]
+    if not nullable_first:
+        return sa.tuple_(*cols) < sa.tuple_(*vals)
+
+    first, rest_cols, rest_vals = cols[0], cols[1:], vals[1:]
+    if values[0] is None:
+        return sa.and_(first.is_(None), sa.tuple_(*rest_cols) < sa.tuple_(*rest_vals))
+    return sa.or_(sa.tuple_(*cols) < sa.tuple_(*vals), first.is_(None))
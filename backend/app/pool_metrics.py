@@ -0,0 +1,102 @@
+"""
+Connection pool instrumentation, reported by /meta/pool.
+
+InstrumentedQueuePool / InstrumentedAsyncQueuePool time every checkout (including any wait
+for a free connection and the connect itself when the pool grows) into a PoolMetrics
+histogram, and count checkouts that hit pool_timeout. Live occupancy (checked out,
+overflow, idle) comes straight from the pool. Numbers are per API process.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Dict, Tuple
+
+import sqlalchemy as sa
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# upper bounds (ms) of the checkout wait histogram buckets; the last bucket is open-ended
+WAIT_BUCKETS_MS: Tuple[float, ...] = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+class PoolMetrics:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.counts = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+
+    def observe(self, wait_ms: float) -> None:
+        with self._lock:
+            self.counts[bisect_left(WAIT_BUCKETS_MS, wait_ms)] += 1
+            self.checkouts += 1
+            self.total_wait_ms += wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+
+    def timed_out(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            labels = [f"<={b:g}ms" for b in WAIT_BUCKETS_MS] + [f">{WAIT_BUCKETS_MS[-1]:g}ms"]
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_ms_avg": round(self.total_wait_ms / self.checkouts, 3) if self.checkouts else None,
+                "wait_ms_max": round(self.max_wait_ms, 3),
+                "wait_ms_histogram": dict(zip(labels, self.counts)),
+            }
+
+
+class _InstrumentedMixin:
+    metrics: PoolMetrics
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics  # keep counting across engine.dispose()
+        return pool
+
+    def _do_get(self):
+        t0 = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except sa.exc.TimeoutError:
+            self.metrics.timed_out()
+            raise
+        self.metrics.observe((time.perf_counter() - t0) * 1000.0)
+        return conn
+
+
+class InstrumentedQueuePool(_InstrumentedMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_stats(engine: Any) -> Dict[str, Any]:
+    """Occupancy + checkout wait metrics of an engine's pool (sync Engine or AsyncEngine)."""
+    pool = engine.pool
+    out: Dict[str, Any] = {"class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        out.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            idle=pool.checkedin(),
+            overflow=max(0, pool.overflow()),  # negative while the pool hasn't filled up yet
+            max_overflow=pool._max_overflow,
+            timeout_seconds=pool.timeout(),
+        )
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        out.update(metrics.snapshot())
+    return out
@@ -0,0 +1,119 @@
+"""
+Read-replica routing (READ_REPLICA_URL).
+
+Read-only endpoints take their session from get_read_db / get_async_read_db (app/db.py).
+Those sessions are RoutingSessions: SELECTs go to the replica, anything that writes
+(flush, INSERT/UPDATE/DELETE) goes to the primary. Ingestion, backfills and the write
+endpoints keep using plain primary sessions.
+
+ReplicaLagMonitor decides per request whether the replica may be used at all: it measures
+replay lag at most every REPLICA_LAG_CHECK_SECONDS, and while the replica is more than
+REPLICA_MAX_LAG_SECONDS behind (or unreachable, or not streaming) reads fall back to the primary.
+Only one request at a time runs the probe; the others go by the last measurement.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+# 0 on a primary (or a streaming standby that has replayed everything it received), else seconds
+# since the last replayed transaction; NULL (= unusable) on a standby that hasn't replayed anything
+# yet or isn't streaming from the primary: a disconnected standby has replayed all it received,
+# but that says nothing about how far behind it is. pg_stat_wal_receiver.status is only visible
+# to superusers and pg_read_all_stats members, so the replica login needs one of those.
+LAG_SQL = sa.text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+    """
+)
+
+_WRITE_STATEMENTS = (sa.Insert, sa.Update, sa.Delete)
+
+
+class RoutingSession(Session):
+    """Session that reads from `read_bind` when one is given; flushes and DML always use the primary bind."""
+
+    def __init__(self, *args: Any, read_bind: Optional[sa.engine.Engine] = None, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.read_bind = read_bind
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.read_bind is not None and not self._flushing and not isinstance(clause, _WRITE_STATEMENTS):
+            return self.read_bind
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+
+class ReplicaLagMonitor:
+    def __init__(self, max_lag_seconds: float, check_interval_seconds: float) -> None:
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval_seconds = check_interval_seconds
+        self.lag_seconds: Optional[float] = None  # None = not measured yet / unreachable
+        self.error: Optional[str] = None
+        self.checked_at = 0.0  # time.monotonic() of the last probe
+        self.replica_reads = 0
+        self.primary_fallbacks = 0
+        self._lock = threading.Lock()  # held by the (sync) probe
+        self._counts_lock = threading.Lock()
+        self._checking = False
+
+    def _due(self) -> bool:
+        return time.monotonic() - self.checked_at >= self.check_interval_seconds
+
+    def _record(self, lag: Any = None, error: Optional[BaseException] = None) -> None:
+        self.lag_seconds = float(lag) if lag is not None else None
+        self.error = f"{type(error).__name__}: {error}"[:300] if error is not None else None
+        self.checked_at = time.monotonic()
+
+    def _route(self) -> bool:
+        usable = self.lag_seconds is not None and self.lag_seconds <= self.max_lag_seconds
+        with self._counts_lock:
+            if usable:
+                self.replica_reads += 1
+            else:
+                self.primary_fallbacks += 1
+        return usable
+
+    def check(self, engine: sa.engine.Engine) -> bool:
+        """Whether reads may go to the replica now (sync engine; probes if the last check is stale)."""
+        if self._due() and self._lock.acquire(blocking=False):
+            try:
+                with engine.connect() as conn:
+                    self._record(conn.execute(LAG_SQL).scalar())
+            except Exception as exc:
+                self._record(error=exc)
+            finally:
+                self._lock.release()
+        return self._route()
+
+    async def check_async(self, engine: Any) -> bool:
+        """check() for an AsyncEngine; never blocks the event loop on another request's probe."""
+        if self._due() and not self._checking:
+            self._checking = True
+            try:
+                async with engine.connect() as conn:
+                    self._record((await conn.execute(LAG_SQL)).scalar())
+            except Exception as exc:
+                self._record(error=exc)
+            finally:
+                self._checking = False
+        return self._route()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "lag_seconds": round(self.lag_seconds, 3) if self.lag_seconds is not None else None,
+            "max_lag_seconds": self.max_lag_seconds,
+            "using_replica": self.lag_seconds is not None and self.lag_seconds <= self.max_lag_seconds,
+            "checked_seconds_ago": round(time.monotonic() - self.checked_at, 1) if self.checked_at else None,
+            "error": self.error,
+            "replica_reads": self.replica_reads,
+            "primary_fallbacks": self.primary_fallbacks,
+        }
@@ -0,0 +1,44 @@
+"""
+Fast JSON rendering for the card endpoints (/feed/*, /social/top).
+
+FastAPI runs a route's plain return value through jsonable_encoder and the stdlib json
+encoder. Card routes instead return json_response(payload, response): one orjson.dumps
+call, nothing else. Cards can hold naive-UTC datetimes as-is; orjson writes them as
+"2026-10-18T10:45:00Z", the same string as `dt.isoformat() + "Z"`.
+
+FastAPI only copies headers that dependencies set on the injected `response` (ETag,
+X-Next-Cursor) into responses it builds itself, so json_response copies them over.
+"""
+from __future__ import annotations
+
+from typing import Any, Optional
+
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+_SKIP_HEADERS = {b"content-length", b"content-type"}
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+class ORJSONResponse(JSONResponse):
+    """Response class for routers whose routes return json_response(); also used for the OpenAPI docs."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def json_response(content: Any, response: Optional[Response] = None) -> Response:
+    """`content` is a payload or bytes already rendered by dumps() (e.g. from the response cache)."""
+    body = content if isinstance(content, bytes) else dumps(content)
+    out = Response(content=body, media_type="application/json")
+    if response is not None:
+        out.headers.raw.extend((k, v) for k, v in response.headers.raw if k not in _SKIP_HEADERS)
+        if response.status_code:
+            out.status_code = response.status_code
+    return out
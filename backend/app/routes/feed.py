@@ -1,24 +1,21 @@
 from __future__ import annotations
+import functools
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
-from app.db import SessionLocal
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.cache import cached_response
+from app.db import any_of, get_async_read_db
 from app.models import ContentItem
+from app.pagination import decode_cursor, encode_cursor, keyset_before
+from app.responses import ORJSONResponse, json_response
+from app.services.enrich import live_rank_score, live_urgency
+from app.services.ranking import min_live_rank_filter, min_live_urgency_filter, rank_keyset_columns, rank_order
 from sqlalchemy import func
 import sqlalchemy as sa
 
 
-router = APIRouter(prefix="/feed", tags=["feed"])
-
-
-# ---- DB dependency (kept local so this file works even if you don't have get_db()) ----
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+router = APIRouter(prefix="/feed", tags=["feed"], default_response_class=ORJSONResponse)
 
 
 def _utc_now_naive() -> datetime:
@@ -26,10 +23,9 @@ def _utc_now_naive() -> datetime:
     return datetime.now(timezone.utc).replace(tzinfo=None)
 
 
-def _time_ago(published_at: Optional[datetime]) -> Optional[str]:
+def _time_ago(published_at: Optional[datetime], now: datetime) -> Optional[str]:
     if not published_at:
         return None
-    now = _utc_now_naive()
     delta = now - published_at
     secs = int(delta.total_seconds())
     if secs < 0:
@@ -55,154 +51,338 @@ def _teams_from_entities(entities: Any) -> List[str]:
     return []
 
 
-def _group_key():
+def _group_key(model=ContentItem):
     """
     Stable 'cluster key' even if dedupe_group_id is NULL.
     If dedupe_group_id exists -> group by it
     else -> treat each row as its own cluster using id as string
+    (backed by the ix_content_items_cluster_key expression index)
     """
-    return func.coalesce(ContentItem.dedupe_group_id, func.cast(ContentItem.id, sa.String))
+    return func.coalesce(model.dedupe_group_id, func.cast(model.id, sa.String))
+
+
+# Card fields: the columns each one is computed from, and how. Feed queries select just the
+# columns the requested fields need (?fields=), as plain row tuples: no ORM identity map /
+# instance state per row, and never raw / key_points / search_tsv.
+# cluster_size / cluster_sources are not row values; _to_card takes them as arguments.
+_CARD_VALUES: Dict[str, Tuple[Tuple[Any, ...], Callable[[Any, datetime], Any]]] = {
+    "id": ((ContentItem.id,), lambda r, now: r.id),
+    "title": ((ContentItem.title,), lambda r, now: r.title),
+    "source": ((ContentItem.source,), lambda r, now: r.source),
+    "sport": ((ContentItem.sport,), lambda r, now: r.sport),
+    "published_at": ((ContentItem.published_at,), lambda r, now: r.published_at),
+    "published_ago": ((ContentItem.published_at,), lambda r, now: _time_ago(r.published_at, now)),
+    "url": ((ContentItem.url,), lambda r, now: r.url),
+    "snippet": ((ContentItem.snippet,), lambda r, now: r.snippet),
+    "summary": ((ContentItem.summary,), lambda r, now: r.summary),
+    "topics": ((ContentItem.topics,), lambda r, now: r.topics or []),
+    "teams": ((ContentItem.entities,), lambda r, now: _teams_from_entities(r.entities)),
+    # urgency / rank_score are evaluated at read time so they never go stale
+    "urgency": (
+        (ContentItem.published_at, ContentItem.urgency_bump),
+        lambda r, now: live_urgency(r.published_at, r.urgency_bump, now),
+    ),
+    "rank_score": ((ContentItem.rank_key,), lambda r, now: live_rank_score(r.rank_key, now)),
+    "is_duplicate": ((ContentItem.is_duplicate,), lambda r, now: r.is_duplicate),
+    "source_tier": ((ContentItem.source_tier,), lambda r, now: r.source_tier),
+    "canonical_id": ((ContentItem.canonical_id,), lambda r, now: r.canonical_id),
+    "dedupe_group_id": ((ContentItem.dedupe_group_id,), lambda r, now: r.dedupe_group_id),
+}
+_CLUSTER_FIELDS = ("cluster_size", "cluster_sources")
+
+# The full card (the default), in output order
+CARD_FIELDS: Tuple[str, ...] = tuple(_CARD_VALUES) + _CLUSTER_FIELDS
+
+# ?fields=minimal: enough to render a headline link; also skips the cluster_size query
+MINIMAL_CARD_FIELDS: Tuple[str, ...] = ("id", "title", "source", "sport", "published_at", "url", "urgency", "rank_score")
+
+
+def parse_card_fields(fields: Optional[str]) -> Tuple[str, ...]:
+    """?fields= -> card field names in output order. None / "" = full card; "minimal" = MINIMAL_CARD_FIELDS."""
+    if not fields or not fields.strip():
+        return CARD_FIELDS
+    if fields.strip() == "minimal":
+        return MINIMAL_CARD_FIELDS
+    wanted = {f.strip() for f in fields.split(",") if f.strip()}
+    if not wanted or not wanted <= set(CARD_FIELDS):
+        raise HTTPException(status_code=400, detail="invalid_fields")
+    return tuple(f for f in CARD_FIELDS if f in wanted)
+
+
+@functools.lru_cache(maxsize=256)
+def card_columns(fields: Tuple[str, ...] = CARD_FIELDS, extra: Tuple[Any, ...] = ()) -> Tuple[Any, ...]:
+    """Columns to SELECT for `fields` plus `extra` (e.g. the keyset columns), deduplicated, in a fixed order."""
+    needed = [col for f in fields if f in _CARD_VALUES for col in _CARD_VALUES[f][0]]
+    if "cluster_sources" in fields:
+        needed.append(ContentItem.dedupe_group_id)
+    needed.extend(extra)
+    seen = set()
+    out = []
+    for col in needed:
+        if col.key not in seen:
+            seen.add(col.key)
+            out.append(col)
+    return tuple(out)
+
+
+CARD_COLUMNS = card_columns(CARD_FIELDS)
+
+
+@functools.lru_cache(maxsize=256)
+def _card_getters(fields: Tuple[str, ...]) -> Tuple[Tuple[str, Callable[[Any, datetime], Any]], ...]:
+    return tuple((f, _CARD_VALUES[f][1]) for f in fields if f in _CARD_VALUES)
 
 
 from sqlalchemy.orm import aliased
 
-def _cluster_size_subquery(
+def _cluster_filters(
+    model,
     sport: Optional[str] = None,
     topic: Optional[str] = None,
     team: Optional[str] = None,
     min_urgency: Optional[float] = None,
-):
-    Inner = aliased(ContentItem)
-
-    outer_key = func.coalesce(ContentItem.dedupe_group_id, func.cast(ContentItem.id, sa.String))
-    inner_key = func.coalesce(Inner.dedupe_group_id, func.cast(Inner.id, sa.String))
-
-    q = sa.select(func.count(Inner.id)).where(inner_key == outer_key)
+    now: Optional[datetime] = None,
+) -> List[Any]:
+    """Filters that define which rows count towards cluster_size (also the base feed filters)."""
+    filters: List[Any] = []
 
     if sport:
-        q = q.where(Inner.sport == sport)
+        filters.append(model.sport == sport)
 
     if topic:
-        q = q.where(Inner.topics.contains([topic]))
+        filters.append(model.topics.contains([topic]))
 
     if team:
-        q = q.where(Inner.entities.contains({"teams": [team]}))
+        filters.append(model.entities.contains({"teams": [team]}))
 
     if min_urgency is not None:
-        q = q.where(Inner.urgency >= min_urgency)
+        # urgency decays with age, so it is evaluated now rather than read from the stored snapshot
+        filters.append(min_live_urgency_filter(model, min_urgency, now or _utc_now_naive()))
 
-    return q.scalar_subquery()
+    return filters
 
 
-def _to_card(item: ContentItem, cluster_size: Optional[int] = None, cluster_sources: Optional[List[str]] = None) -> Dict[str, Any]:
-    return {
-        "id": item.id,
-        "title": item.title,
-        "source": item.source,
-        "sport": item.sport,
-        "published_at": item.published_at.isoformat() + "Z" if item.published_at else None,
-        "published_ago": _time_ago(item.published_at),
-        "url": item.url,
-        "snippet": item.snippet,
-        "summary": getattr(item, "summary", None),
-        "topics": getattr(item, "topics", None) or [],
-        "teams": _teams_from_entities(getattr(item, "entities", None)),
-        "urgency": getattr(item, "urgency", None),
-        "rank_score": getattr(item, "rank_score", None),
-        "is_duplicate": getattr(item, "is_duplicate", None),
-        "source_tier": getattr(item, "source_tier", None),
-        "canonical_id": getattr(item, "canonical_id", None),
-        "dedupe_group_id": getattr(item, "dedupe_group_id", None),
+def build_feed_query(
+    page_filters: List[Any],
+    limit: int,
+    sport: Optional[str] = None,
+    topic: Optional[str] = None,
+    team: Optional[str] = None,
+    min_urgency: Optional[float] = None,
+    now: Optional[datetime] = None,
+    fields: Tuple[str, ...] = CARD_FIELDS,
+):
+    """
+    SELECT (*card_columns(fields), cluster_size) for one feed page.
 
-        # NEW: clustering UX
-        "cluster_size": int(cluster_size) if cluster_size is not None else 1,
-        "cluster_sources": cluster_sources or [],
+    The page is ranked and LIMITed first (CTE "page"); cluster sizes are then
+    counted in one grouped pass, only for the cluster keys on that page
+    (CTE "cluster_sizes"), under the same sport/topic/team/urgency filters.
+    This replaces a correlated count(*) per candidate row. Without
+    "cluster_size" in `fields` the count is skipped altogether.
 
-    }
+    The keyset columns are always selected, for the next cursor.
+    """
+    columns = card_columns(fields, rank_keyset_columns(ContentItem))
+    page = (
+        sa.select(ContentItem.id.label("id"), _group_key().label("cluster_key"))
+        .where(*page_filters)
+        .order_by(*rank_order(ContentItem))
+        .limit(limit)
+        .cte("page")
+    )
+
+    if "cluster_size" not in fields:
+        return (
+            sa.select(*columns)
+            .join(page, page.c.id == ContentItem.id)
+            .order_by(*rank_order(ContentItem))
+        )
 
+    Inner = aliased(ContentItem)
+    inner_key = _group_key(Inner)
+    sizes = (
+        sa.select(inner_key.label("cluster_key"), func.count(Inner.id).label("cluster_size"))
+        .where(
+            inner_key.in_(sa.select(page.c.cluster_key)),
+            *_cluster_filters(Inner, sport=sport, topic=topic, team=team, min_urgency=min_urgency, now=now),
+        )
+        .group_by(inner_key)
+        .cte("cluster_sizes")
+    )
 
+    return (
+        sa.select(*columns, func.coalesce(sizes.c.cluster_size, 0).label("cluster_size"))
+        .join(page, page.c.id == ContentItem.id)
+        .outerjoin(sizes, sizes.c.cluster_key == page.c.cluster_key)
+        .order_by(*rank_order(ContentItem))
+    )
 
-@router.get("/top")
-def top_feed(
-    sport: Optional[str] = Query(default=None, description="Filter by sport (nba/nfl/cfb/mlb/nhl/etc.)"),
-    limit: int = Query(default=50, ge=1, le=200),
-    include_duplicates: bool = Query(default=False),
-    topic: Optional[str] = Query(default=None, description="Filter by a topic tag (injury/trade/betting/etc.)"),
-    team: Optional[str] = Query(default=None, description="Filter by team code (LAL, GSW, KC, etc.)"),
-    include_cluster_sources: bool = Query(default=False, description="If true, include distinct source list per cluster"),
-    min_rank_score: float = Query(default=0.0, ge=0.0, description="Drop low-ranked items"),
-    min_source_tier: int = Query(default=0, ge=0, description="Drop sources below this tier"),
 
-        db: Session = Depends(get_db),
-):
-    # --- build base filters once so cluster_size matches the feed filters ---
-    base_filters = []
+# Feed cursors are (rank_key, published_at, id) of the last card on the page
+FEED_CURSOR_TYPES = (float, datetime, int)
 
-    if sport:
-        base_filters.append(ContentItem.sport == sport)
 
-    if topic and hasattr(ContentItem, "topics"):
-        base_filters.append(ContentItem.topics.contains([topic]))
+def _feed_cursor(rows) -> Optional[str]:
+    last = rows[-1]
+    return encode_cursor([last.rank_key, last.published_at, last.id])
 
-    if team:
-        team = team.strip().upper()
-        base_filters.append(ContentItem.entities.contains({"teams": [team]}))
 
-    q = db.query(ContentItem)
+def _row_cluster_size(row) -> Optional[int]:
+    # only present when the page was built with "cluster_size" in fields
+    return row.cluster_size if "cluster_size" in row._fields else None
 
-    if base_filters:
-        q = q.filter(*base_filters)
 
-    if not include_duplicates and hasattr(ContentItem, "is_duplicate"):
-        q = q.filter(ContentItem.is_duplicate == False)  # noqa: E712
+def _quality_filters(
+    include_duplicates: bool,
+    min_rank_score: float,
+    min_source_tier: int,
+    now: datetime,
+    after: Optional[List[Any]] = None,
+) -> List[Any]:
+    filters: List[Any] = []
+
+    if after is not None:
+        filters.append(keyset_before(rank_keyset_columns(ContentItem), after))
+
+    if not include_duplicates:
+        filters.append(ContentItem.is_duplicate == False)  # noqa: E712
 
     # ----------------------------
     # Query-time quality filters
     # ----------------------------
-    if min_rank_score > 0 and hasattr(ContentItem, "rank_score"):
-        q = q.filter(ContentItem.rank_score.isnot(None), ContentItem.rank_score >= min_rank_score)
+    if min_rank_score > 0:
+        filters.append(min_live_rank_filter(ContentItem, min_rank_score, now))
 
-    if min_source_tier > 0 and hasattr(ContentItem, "source_tier"):
-        q = q.filter(ContentItem.source_tier.isnot(None), ContentItem.source_tier >= min_source_tier)
+    if min_source_tier > 0:
+        filters.extend([ContentItem.source_tier.isnot(None), ContentItem.source_tier >= min_source_tier])
 
-    # Use correlated subquery for cluster size under the same filters
-    group_key = _group_key()
-    cluster_size_sq = _cluster_size_subquery(
-        sport=sport,
-        topic=topic if topic else None,
-        team=team if team else None,
-    ).label("cluster_size")
-    q = q.add_columns(cluster_size_sq)
-
-    # Order by rank_score if present; else fallback to recency
-    if hasattr(ContentItem, "rank_score"):
-        q = q.order_by(ContentItem.rank_score.desc().nullslast(), ContentItem.published_at.desc())
-    else:
-        q = q.order_by(ContentItem.published_at.desc())
+    return filters
+
+
+def build_top_query(
+    sport: Optional[str] = None,
+    limit: int = 50,
+    include_duplicates: bool = False,
+    topic: Optional[str] = None,
+    team: Optional[str] = None,
+    min_rank_score: float = 0.0,
+    min_source_tier: int = 0,
+    now: Optional[datetime] = None,
+    after: Optional[List[Any]] = None,
+    fields: Tuple[str, ...] = CARD_FIELDS,
+):
+    now = now or _utc_now_naive()
+    if team:
+        team = team.strip().upper()
+
+    # --- build base filters once so cluster_size matches the feed filters ---
+    page_filters = _cluster_filters(ContentItem, sport=sport, topic=topic, team=team)
+    page_filters += _quality_filters(include_duplicates, min_rank_score, min_source_tier, now, after)
+
+    return build_feed_query(page_filters, limit, sport=sport, topic=topic, team=team, now=now, fields=fields)
+
+
+def build_breaking_query(
+    sport: Optional[str] = None,
+    limit: int = 50,
+    min_urgency: float = 0.9,
+    include_duplicates: bool = False,
+    min_rank_score: float = 0.0,
+    min_source_tier: int = 0,
+    now: Optional[datetime] = None,
+    after: Optional[List[Any]] = None,
+    fields: Tuple[str, ...] = CARD_FIELDS,
+):
+    now = now or _utc_now_naive()
+
+    page_filters = _cluster_filters(ContentItem, sport=sport, min_urgency=min_urgency, now=now)
+    page_filters += _quality_filters(include_duplicates, min_rank_score, min_source_tier, now, after)
+
+    return build_feed_query(page_filters, limit, sport=sport, min_urgency=min_urgency, now=now, fields=fields)
+
+
+async def _cluster_sources(db: AsyncSession, group_ids) -> Dict[str, List[str]]:
+    """dedupe_group_id -> distinct sources, for every cluster on the page in one grouped query."""
+    ids = {g for g in group_ids if g}
+    if not ids:
+        return {}
+    rows = (await db.execute(
+        sa.select(ContentItem.dedupe_group_id, func.array_agg(sa.distinct(ContentItem.source)))
+        .where(ContentItem.dedupe_group_id == any_of(ids))
+        .group_by(ContentItem.dedupe_group_id)
+    )).all()
+    return {group_id: list(sources or []) for group_id, sources in rows}
+
+
+def _to_card(
+    row: Any,
+    now: datetime,
+    fields: Tuple[str, ...] = CARD_FIELDS,
+    cluster_size: Optional[int] = None,
+    cluster_sources: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """Card for a row of card_columns(fields); datetimes are left to the orjson renderer (app/responses.py)."""
+    card = {name: value(row, now) for name, value in _card_getters(fields)}
 
-    rows = q.limit(limit).all()  # rows = [(ContentItem, cluster_size), ...]
+    # NEW: clustering UX (last in CARD_FIELDS, so appending keeps the field order)
+    if "cluster_size" in fields:
+        card["cluster_size"] = int(cluster_size) if cluster_size is not None else 1
+    if "cluster_sources" in fields:
+        card["cluster_sources"] = cluster_sources or []
+    return card
+
+
+
+@router.get("/top")
+@cached_response("feed.top")
+async def top_feed(
+    response: Response,
+    sport: Optional[str] = Query(default=None, description="Filter by sport (nba/nfl/cfb/mlb/nhl/etc.)"),
+    limit: int = Query(default=50, ge=1, le=200),
+    include_duplicates: bool = Query(default=False),
+    topic: Optional[str] = Query(default=None, description="Filter by a topic tag (injury/trade/betting/etc.)"),
+    team: Optional[str] = Query(default=None, description="Filter by team code (LAL, GSW, KC, etc.)"),
+    include_cluster_sources: bool = Query(default=False, description="If true, include distinct source list per cluster"),
+    min_rank_score: float = Query(default=0.0, ge=0.0, description="Drop low-ranked items"),
+    min_source_tier: int = Query(default=0, ge=0, description="Drop sources below this tier"),
+    cursor: Optional[str] = Query(default=None, description="next_cursor from the previous page"),
+    fields: Optional[str] = Query(default=None, description="Comma-separated card fields, or 'minimal' (default: the full card)"),
+
+        db: AsyncSession = Depends(get_async_read_db),
+):
+    now = _utc_now_naive()
+    card_fields = parse_card_fields(fields)
+    stmt = build_top_query(
+        sport=sport,
+        limit=limit,
+        include_duplicates=include_duplicates,
+        topic=topic,
+        team=team,
+        min_rank_score=min_rank_score,
+        min_source_tier=min_source_tier,
+        now=now,
+        after=decode_cursor(cursor, FEED_CURSOR_TYPES),
+        fields=card_fields,
+    )
+    rows = (await db.execute(stmt)).all()  # rows = [(*card_columns(card_fields), [cluster_size]), ...]
+
+    want_sources = include_cluster_sources and "cluster_sources" in card_fields
+    sources_by_group = await _cluster_sources(db, (row.dedupe_group_id for row in rows)) if want_sources else {}
 
     items_out = []
-    for item, cluster_size in rows:
-        sources = []
-        if include_cluster_sources and getattr(item, "dedupe_group_id", None):
-            sources = [
-                r[0]
-                for r in (
-                    db.query(ContentItem.source)
-                    .filter(ContentItem.dedupe_group_id == item.dedupe_group_id)
-                    .distinct()
-                    .all()
-                )
-            ]
+    for row in rows:
+        sources = sources_by_group.get(row.dedupe_group_id, []) if want_sources else []
 
-        items_out.append(_to_card(item, cluster_size=cluster_size, cluster_sources=sources))
+        items_out.append(_to_card(row, now, card_fields, cluster_size=_row_cluster_size(row), cluster_sources=sources))
 
-    return {"items": items_out}
+    return {"items": items_out, "next_cursor": _feed_cursor(rows) if len(rows) == limit else None}
 
 
 @router.get("/breaking")
-def breaking_feed(
+@cached_response("feed.breaking")
+async def breaking_feed(
+    response: Response,
     sport: Optional[str] = Query(default=None),
     limit: int = Query(default=50, ge=1, le=200),
     min_urgency: float = Query(default=0.9, ge=0.0, le=1.0),
@@ -210,150 +390,120 @@ def breaking_feed(
     include_cluster_sources: bool = Query(default=False),
     min_rank_score: float = Query(default=0.0, ge=0.0),
     min_source_tier: int = Query(default=0, ge=0),
+    cursor: Optional[str] = Query(default=None, description="next_cursor from the previous page"),
+    fields: Optional[str] = Query(default=None, description="Comma-separated card fields, or 'minimal' (default: the full card)"),
 
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_async_read_db),
 ):
-    base_filters = []
-
-    if sport:
-        base_filters.append(ContentItem.sport == sport)
-
-    if hasattr(ContentItem, "urgency"):
-        base_filters.append(ContentItem.urgency >= min_urgency)
-
-    q = db.query(ContentItem)
-
-    if base_filters:
-        q = q.filter(*base_filters)
-
-    if not include_duplicates and hasattr(ContentItem, "is_duplicate"):
-        q = q.filter(ContentItem.is_duplicate == False)  # noqa: E712
-
-    # ----------------------------
-    # Query-time quality filters
-    # ----------------------------
-    if min_rank_score > 0 and hasattr(ContentItem, "rank_score"):
-        q = q.filter(ContentItem.rank_score.isnot(None), ContentItem.rank_score >= min_rank_score)
-
-    if min_source_tier > 0 and hasattr(ContentItem, "source_tier"):
-        q = q.filter(ContentItem.source_tier.isnot(None), ContentItem.source_tier >= min_source_tier)
-
-    group_key = _group_key()
-    cluster_size_sq = _cluster_size_subquery(
+    now = _utc_now_naive()
+    card_fields = parse_card_fields(fields)
+    stmt = build_breaking_query(
         sport=sport,
+        limit=limit,
         min_urgency=min_urgency,
-    ).label("cluster_size")
-    q = q.add_columns(cluster_size_sq)
-
-    if hasattr(ContentItem, "rank_score"):
-        q = q.order_by(ContentItem.rank_score.desc().nullslast(), ContentItem.published_at.desc())
-    else:
-        q = q.order_by(ContentItem.published_at.desc())
-
-    rows = q.limit(limit).all()
+        include_duplicates=include_duplicates,
+        min_rank_score=min_rank_score,
+        min_source_tier=min_source_tier,
+        now=now,
+        after=decode_cursor(cursor, FEED_CURSOR_TYPES),
+        fields=card_fields,
+    )
+    rows = (await db.execute(stmt)).all()
+
+    want_sources = include_cluster_sources and "cluster_sources" in card_fields
+    sources_by_group = await _cluster_sources(db, (row.dedupe_group_id for row in rows)) if want_sources else {}
 
     items_out = []
-    for item, cluster_size in rows:
-        sources = []
-        if include_cluster_sources and getattr(item, "dedupe_group_id", None):
-            sources = [
-                r[0]
-                for r in (
-                    db.query(ContentItem.source)
-                    .filter(ContentItem.dedupe_group_id == item.dedupe_group_id)
-                    .distinct()
-                    .all()
-                )
-            ]
-        items_out.append(_to_card(item, cluster_size=cluster_size, cluster_sources=sources))
-
-    return {"items": items_out}
+    for row in rows:
+        sources = sources_by_group.get(row.dedupe_group_id, []) if want_sources else []
+        items_out.append(_to_card(row, now, card_fields, cluster_size=_row_cluster_size(row), cluster_sources=sources))
+
+    return {"items": items_out, "next_cursor": _feed_cursor(rows) if len(rows) == limit else None}
 
 @router.get("/cluster/{dedupe_group_id}")
-def get_cluster(
+async def get_cluster(
+    response: Response,
     dedupe_group_id: str,
     limit: int = Query(default=50, ge=1, le=200),
-    db: Session = Depends(get_db),
+    fields: Optional[str] = Query(default=None, description="Comma-separated card fields, or 'minimal' (default: the full card)"),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    q = db.query(ContentItem).filter(ContentItem.dedupe_group_id == dedupe_group_id)
+    card_fields = parse_card_fields(fields)
+    q = sa.select(*card_columns(card_fields)).where(ContentItem.dedupe_group_id == dedupe_group_id)
 
     # Order duplicates by "best first"
-    if hasattr(ContentItem, "rank_score"):
-        if hasattr(ContentItem, "source_tier"):
-            q = q.order_by(
-                ContentItem.rank_score.desc().nullslast(),
-                ContentItem.source_tier.desc().nullslast(),
-                ContentItem.published_at.desc(),
-            )
-        else:
-            q = q.order_by(
-                ContentItem.rank_score.desc().nullslast(),
-                ContentItem.published_at.desc(),
-            )
-    else:
-        q = q.order_by(ContentItem.published_at.desc())
+    q = q.order_by(
+        ContentItem.rank_key.desc(),
+        ContentItem.source_tier.desc().nullslast(),
+        ContentItem.published_at.desc(),
+    )
 
-    items = q.limit(limit).all()
-    return {"items": [_to_card(x) for x in items]}
+    rows = (await db.execute(q.limit(limit))).all()
+    now = _utc_now_naive()
+    return json_response({"items": [_to_card(x, now, card_fields) for x in rows]}, response)
 
 @router.get("/item/{item_id}")
-def get_item(
+async def get_item(
+    response: Response,
     item_id: int,
     include_cluster_sources: bool = Query(default=True),
-    db: Session = Depends(get_db),
+    fields: Optional[str] = Query(default=None, description="Comma-separated card fields, or 'minimal' (default: the full card)"),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    item = db.query(ContentItem).filter(ContentItem.id == item_id).first()
+    card_fields = parse_card_fields(fields)
+    columns = card_columns(card_fields, (ContentItem.dedupe_group_id,))
+    item = (await db.execute(sa.select(*columns).where(ContentItem.id == item_id))).first()
     if not item:
-        return {"error": "not_found"}
+        return json_response({"error": "not_found"}, response)
 
     # cluster_size for this specific item
     cluster_size = 1
-    if getattr(item, "dedupe_group_id", None):
+    if "cluster_size" in card_fields and item.dedupe_group_id:
         cluster_size = (
-            db.query(func.count(ContentItem.id))
-            .filter(ContentItem.dedupe_group_id == item.dedupe_group_id)
-            .scalar()
+            await db.scalar(
+                sa.select(func.count(ContentItem.id))
+                .where(ContentItem.dedupe_group_id == item.dedupe_group_id)
+            )
         ) or 1
 
     cluster_sources = []
-    if include_cluster_sources and getattr(item, "dedupe_group_id", None):
-        cluster_sources = [
-            r[0]
-            for r in (
-                db.query(ContentItem.source)
-                .filter(ContentItem.dedupe_group_id == item.dedupe_group_id)
-                .distinct()
-                .all()
-            )
-        ]
+    if include_cluster_sources and "cluster_sources" in card_fields and item.dedupe_group_id:
+        cluster_sources = (await _cluster_sources(db, [item.dedupe_group_id])).get(item.dedupe_group_id, [])
 
-    return {"item": _to_card(item, cluster_size=cluster_size, cluster_sources=cluster_sources)}
+    card = _to_card(item, _utc_now_naive(), card_fields, cluster_size=cluster_size, cluster_sources=cluster_sources)
+    return json_response({"item": card}, response)
 
 @router.get("/related")
-def related(
+async def related(
+    response: Response,
     item_id: int = Query(..., ge=1),
     limit: int = Query(default=20, ge=1, le=100),
-    db: Session = Depends(get_db),
+    fields: Optional[str] = Query(default=None, description="Comma-separated card fields, or 'minimal' (default: the full card)"),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    item = db.query(ContentItem).filter(ContentItem.id == item_id).first()
+    card_fields = parse_card_fields(fields)
+    item = (await db.execute(
+        sa.select(ContentItem.id, ContentItem.sport, ContentItem.topics, ContentItem.entities, ContentItem.dedupe_group_id)
+        .where(ContentItem.id == item_id)
+    )).first()
     if not item:
-        return {"items": []}
+        return json_response({"items": []}, response)
 
-    sport = getattr(item, "sport", None)
-    topics = getattr(item, "topics", None) or []
-    teams = _teams_from_entities(getattr(item, "entities", None))
+    sport = item.sport
+    topics = item.topics or []
+    teams = _teams_from_entities(item.entities)
 
-    q = db.query(ContentItem)
+    q = sa.select(*card_columns(card_fields))
 
     if sport:
-        q = q.filter(ContentItem.sport == sport)
+        q = q.where(ContentItem.sport == sport)
 
     # Exclude itself
-    q = q.filter(ContentItem.id != item.id)
+    q = q.where(ContentItem.id != item.id)
 
     # Exclude same cluster (so “related” isn’t just duplicates)
-    if getattr(item, "dedupe_group_id", None):
-        q = q.filter(
+    if item.dedupe_group_id:
+        q = q.where(
             sa.or_(
                 ContentItem.dedupe_group_id.is_(None),
                 ContentItem.dedupe_group_id != item.dedupe_group_id,
@@ -372,19 +522,16 @@ def related(
         clauses.append(ContentItem.topics.op("&&")(sa.cast(topics, sa.ARRAY(sa.Text))))
 
     if clauses:
-        q = q.filter(sa.or_(*clauses))
+        q = q.where(sa.or_(*clauses))
     else:
         # fallback: if we have no teams/topics, just return recent in same sport
         pass
 
     # Rank best-first, then newest
-    if hasattr(ContentItem, "rank_score"):
-        q = q.order_by(ContentItem.rank_score.desc().nullslast(), ContentItem.published_at.desc())
-    else:
-        q = q.order_by(ContentItem.published_at.desc())
+    q = q.order_by(*rank_order(ContentItem))
 
-    items = q.limit(limit).all()
+    rows = (await db.execute(q.limit(limit))).all()
 
     # Optional: cluster_size for related items (cheap version: omit, or compute only when expanding)
-    return {"items": [_to_card(x) for x in items]}
-
+    now = _utc_now_naive()
+    return json_response({"items": [_to_card(x, now, card_fields) for x in rows]}, response)
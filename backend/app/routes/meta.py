@@ -1,12 +1,18 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timezone
-from sqlalchemy import text
-from ..db import get_db
-from ..models import ContentItem, IngestRun
+from sqlalchemy import select, text
+from ..cache import cached_response, response_cache
+from ..db import async_engine, async_replica_engine, engine, get_async_db, get_async_read_db, replica_engine, replica_lag
+from ..etag import etag_dependency
+from ..models import ContentItem, ContentStat, IngestRun
+from ..pool_metrics import pool_stats
+from ..settings import settings
+from ..services.content_stats import ALL_KEY, load_stats
 router = APIRouter(prefix="/meta", tags=["meta"])
 
+sports_etag = etag_dependency("meta.sports", ContentItem, ContentItem.published_at)
+
 SPORT_LABELS = {
     "nba": "NBA",
     "nfl": "NFL",
@@ -17,56 +23,31 @@ SPORT_LABELS = {
     "nascar": "NASCAR",
 }
 
-@router.get("/sports")
-def list_sports_and_sources(db: Session = Depends(get_db)):
-    # sport aggregation
-    sport_rows = (
-        db.query(
-            ContentItem.sport,
-            func.count(ContentItem.id).label("count"),
-            func.max(ContentItem.published_at).label("last_published_at"),
-        )
-        .group_by(ContentItem.sport)
-        .order_by(ContentItem.sport)
-        .all()
-    )
-
+@router.get("/sports", dependencies=[Depends(sports_etag)])
+@cached_response("meta.sports")
+async def list_sports_and_sources(db: AsyncSession = Depends(get_async_read_db)):
+    # O(#sports + #sources): served from the content_stats rollup, not content_items
     sports_out = []
-    for sport, count, last_published_at in sport_rows:
-        if sport is None:
-            continue
+    for stat in await load_stats(db, "sport"):
         sports_out.append({
-            "key": sport,
-            "label": SPORT_LABELS.get(sport, sport.upper()),
-            "count": int(count),
-            "last_published_at": last_published_at.isoformat() if last_published_at else None,
+            "key": stat.key,
+            "label": SPORT_LABELS.get(stat.key, stat.key.upper()),
+            "count": int(stat.count),
+            "last_published_at": stat.last_published_at.isoformat() if stat.last_published_at else None,
         })
 
-    # source aggregation
-    source_rows = (
-        db.query(
-            ContentItem.source,
-            func.count(ContentItem.id).label("count"),
-            func.max(ContentItem.published_at).label("last_published_at"),
-        )
-        .group_by(ContentItem.source)
-        .order_by(ContentItem.source)
-        .all()
-    )
-
     sources_out = []
-    for source, count, last_published_at in source_rows:
-        if source is None:
-            continue
+    for stat in await load_stats(db, "source"):
         sources_out.append({
-            "key": source,
-            "label": source,
-            "count": int(count),
-            "last_published_at": last_published_at.isoformat() if last_published_at else None,
+            "key": stat.key,
+            "label": stat.key,
+            "count": int(stat.count),
+            "last_published_at": stat.last_published_at.isoformat() if stat.last_published_at else None,
         })
 
     # global last update (nice for footer/status)
-    global_last = db.query(func.max(ContentItem.published_at)).scalar()
+    totals = await db.get(ContentStat, ("all", ALL_KEY))
+    global_last = totals.last_published_at if totals else None
 
     return {
         "sports": sports_out,
@@ -74,23 +55,32 @@ def list_sports_and_sources(db: Session = Depends(get_db)):
         "global_last_published_at": global_last.isoformat() if global_last else None,
     }
 
+def _replica_status():
+    if replica_engine is None:
+        return {"configured": False}
+    return {"configured": True, **replica_lag.stats()}
+
+
 @router.get("/health")
-def health(db: Session = Depends(get_db)):
-    # Basic DB connectivity check
+async def health(db: AsyncSession = Depends(get_async_db)):
+    # Basic DB connectivity check (always the primary: ingest runs are written there)
     try:
-        db.execute(text("SELECT 1"))
+        await db.execute(text("SELECT 1"))
         db_ok = True
     except Exception:
         db_ok = False
 
-    total_items = db.query(func.count(ContentItem.id)).scalar() if db_ok else None
-    global_last = db.query(func.max(ContentItem.published_at)).scalar() if db_ok else None
+    totals = await db.get(ContentStat, ("all", ALL_KEY)) if db_ok else None
+    total_items = (totals.count if totals else 0) if db_ok else None
+    global_last = totals.last_published_at if totals else None
 
     last_run = (
-        db.query(IngestRun)
-        .order_by(IngestRun.started_at.desc())
-        .first()
-    )
+        await db.scalars(
+            select(IngestRun)
+            .order_by(IngestRun.started_at.desc())
+            .limit(1)
+        )
+    ).first()
 
     last_run_out = None
     if last_run:
@@ -100,6 +90,9 @@ def health(db: Session = Depends(get_db)):
             "started_at": last_run.started_at.isoformat() if last_run.started_at else None,
             "finished_at": last_run.finished_at.isoformat() if last_run.finished_at else None,
             "inserted_count": last_run.inserted_count,
+            "not_modified_count": last_run.not_modified_count,
+            "unchanged_count": last_run.unchanged_count,
+            "skipped_count": last_run.skipped_count,
             "error": last_run.error,
         }
 
@@ -113,6 +106,32 @@ def health(db: Session = Depends(get_db)):
         "ingestion": {
             "last_run": last_run_out
         },
+        "replica": _replica_status(),
         "server_time_utc": datetime.now(timezone.utc).isoformat(),
     }
 
+
+@router.get("/cache")
+async def cache_stats():
+    """Hit/miss counters of the in-process response cache (per API worker process)."""
+    return response_cache.stats()
+
+
+@router.get("/pool")
+async def pool_status():
+    """Connection pool occupancy and checkout wait histogram (per API worker process)."""
+    return {
+        "config": {
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout_seconds": settings.DB_POOL_TIMEOUT_SECONDS,
+            "pool_recycle_seconds": settings.DB_POOL_RECYCLE_SECONDS,
+            "statement_timeout_ms": settings.DB_STATEMENT_TIMEOUT_MS,
+            "pgbouncer": settings.DB_PGBOUNCER,
+        },
+        "async": pool_stats(async_engine),
+        "sync": pool_stats(engine),
+        "replica_async": pool_stats(async_replica_engine) if async_replica_engine is not None else None,
+        "replica_sync": pool_stats(replica_engine) if replica_engine is not None else None,
+    }
+
@@ -1,30 +1,61 @@
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
-from ..db import get_db
+from datetime import datetime
+
+import sqlalchemy as sa
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..db import get_async_read_db
 from ..models import ContentItem
+from ..pagination import decode_cursor, encode_cursor, keyset_before
+from ..services.search import SEARCH_MODES, search_filter, search_score
 
 router = APIRouter(prefix="/news", tags=["news"])
 
+# the list item fields, selected as plain columns (no ORM instances, no raw / search_tsv)
+NEWS_COLUMNS = (
+    ContentItem.id,
+    ContentItem.source,
+    ContentItem.sport,
+    ContentItem.title,
+    ContentItem.url,
+    ContentItem.published_at,
+    ContentItem.snippet,
+)
+
 @router.get("")
-def list_news(
+async def list_news(
+    response: Response,
     sport: str | None = Query(default=None),
     source: str | None = Query(default=None),
     q: str | None = Query(default=None),
     limit: int = 50,
-    db: Session = Depends(get_db),
+    cursor: str | None = Query(default=None, description="X-Next-Cursor from the previous page"),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    query = db.query(ContentItem)
+    query = sa.select(*NEWS_COLUMNS)
 
     if sport:
         sports = [s.strip().lower() for s in sport.split(",")]
-        query = query.filter(ContentItem.sport.in_(sports))
+        query = query.where(ContentItem.sport.in_(sports))
     if source:
-        query = query.filter(ContentItem.source == source)
+        query = query.where(ContentItem.source == source)
+
+    q = (q or "").strip()
     if q:
-        like = f"%{q}%"
-        query = query.filter(ContentItem.title.ilike(like))
+        items, next_key = await _search_page(db, query, q, limit, cursor)
+    else:
+        # keyset on (published_at, id), served by ix_content_items_published_at_id
+        after = decode_cursor(cursor, (datetime, int))
+        if after is not None:
+            query = query.where(keyset_before((ContentItem.published_at, ContentItem.id), after))
+
+        query = query.order_by(ContentItem.published_at.desc(), ContentItem.id.desc()).limit(limit)
+        items = (await db.execute(query)).all()
+        next_key = [items[-1].published_at, items[-1].id] if items else None
+
+    # The body stays a plain list for existing clients; the cursor rides in a header
+    if next_key and len(items) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(next_key)
 
-    items = query.order_by(ContentItem.published_at.desc()).limit(limit).all()
     return [
         {
             "id": i.id,
@@ -37,3 +68,30 @@ def list_news(
         }
         for i in items
     ]
+
+
+async def _search_page(db: AsyncSession, query: sa.Select, q: str, limit: int, cursor: str | None):
+    """
+    Relevance-ordered page for ?q= (see services/search.py).
+    Full-text first; trigram fallback only when full-text has no hits at all.
+    The cursor pins the mode so later pages never switch between the two.
+    """
+    after = decode_cursor(cursor, (str, float, int))
+    if after is not None and after[0] not in SEARCH_MODES:
+        raise HTTPException(status_code=400, detail="invalid_cursor")
+    modes = [after[0]] if after is not None else SEARCH_MODES
+
+    for mode in modes:
+        score = search_score(ContentItem, mode, q)
+        page = query.add_columns(score.label("search_score")).where(search_filter(ContentItem, mode, q))
+        if after is not None:
+            page = page.where(keyset_before((score, ContentItem.id), after[1:]))
+
+        rows = (await db.execute(page.order_by(score.desc(), ContentItem.id.desc()).limit(limit))).all()
+        if rows or after is not None:
+            break
+
+    if not rows:
+        return [], None
+    last = rows[-1]
+    return rows, [mode, last.search_score, last.id]
@@ -1,34 +1,32 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, Query, Body
+from fastapi import APIRouter, Depends, Query, Body, Request, Response
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
-from pydantic import BaseModel, Field
-from app.db import SessionLocal
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field, ValidationError
+from app.db import SessionLocal, get_db, get_read_db
 from app.models import SocialPost
+from app.ndjson import NDJSONResponse, iter_lines, ndjson_line
+from app.pagination import decode_cursor, encode_cursor, keyset_before
+from app.responses import ORJSONResponse, json_response
+from app.settings import settings
 
 
 router = APIRouter(prefix="/social", tags=["social"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 def _utc_now_naive() -> datetime:
     return datetime.now(timezone.utc).replace(tzinfo=None)
 
 
-def _time_ago(dt: Optional[datetime]) -> Optional[str]:
+def _time_ago(dt: Optional[datetime], now: datetime) -> Optional[str]:
     if not dt:
         return None
-    delta = _utc_now_naive() - dt
+    delta = now - dt
     secs = int(delta.total_seconds())
     if secs < 0:
         secs = 0
@@ -59,7 +57,24 @@ def _derive_post_id(platform: str, permalink: str) -> str:
     return f"{platform}:{permalink.strip()}"
 
 
-def _to_card(p: SocialPost) -> Dict[str, Any]:
+# columns /social/top selects: plain row tuples instead of SocialPost instances
+CARD_COLUMNS = (
+    SocialPost.id,
+    SocialPost.platform,
+    SocialPost.handle,
+    SocialPost.post_id,
+    SocialPost.permalink,
+    SocialPost.text,
+    SocialPost.created_at,
+    SocialPost.media_urls,
+    SocialPost.metrics,
+    SocialPost.source_tier,
+    SocialPost.rank_score,
+)
+
+
+def _to_card(p: Any, now: datetime) -> Dict[str, Any]:
+    """Card for a CARD_COLUMNS row; created_at is rendered by orjson ("...Z")."""
     return {
         "id": p.id,
         "platform": p.platform,
@@ -67,8 +82,8 @@ def _to_card(p: SocialPost) -> Dict[str, Any]:
         "post_id": p.post_id,
         "permalink": p.permalink,
         "text": p.text,
-        "created_at": p.created_at.isoformat() + "Z" if p.created_at else None,
-        "created_ago": _time_ago(p.created_at),
+        "created_at": p.created_at,
+        "created_ago": _time_ago(p.created_at, now),
         "media_urls": p.media_urls or [],
         "metrics": p.metrics or {},
         "source_tier": p.source_tier,
@@ -76,14 +91,16 @@ def _to_card(p: SocialPost) -> Dict[str, Any]:
     }
 
 
-@router.get("/top")
+@router.get("/top", response_class=ORJSONResponse)
 def social_top(
+    response: Response,
     platform: Optional[str] = Query(default=None, description="x or instagram"),
     handle: Optional[str] = Query(default=None, description="filter by account handle"),
     limit: int = Query(default=50, ge=1, le=200),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(default=None, description="next_cursor from the previous page"),
+    db: Session = Depends(get_read_db),
 ):
-    q = db.query(SocialPost)
+    q = db.query(*CARD_COLUMNS)
 
     if platform:
         q = q.filter(SocialPost.platform == platform)
@@ -91,11 +108,22 @@ def social_top(
     if handle:
         q = q.filter(SocialPost.handle == handle.strip().lstrip("@"))
 
+    # keyset on (rank_score, created_at, id), served by ix_social_rank_keyset
+    after = decode_cursor(cursor, (float, datetime, int))
+    if after is not None:
+        keyset_cols = (SocialPost.rank_score, SocialPost.created_at, SocialPost.id)
+        q = q.filter(keyset_before(keyset_cols, after, nullable_first=True))
+
     # best-first: rank_score then recency
-    q = q.order_by(SocialPost.rank_score.desc().nullslast(), SocialPost.created_at.desc())
+    q = q.order_by(SocialPost.rank_score.desc().nullslast(), SocialPost.created_at.desc(), SocialPost.id.desc())
 
     posts = q.limit(limit).all()
-    return {"items": [_to_card(p) for p in posts]}
+    next_cursor = None
+    if len(posts) == limit:
+        last = posts[-1]
+        next_cursor = encode_cursor([last.rank_score, last.created_at, last.id])
+    now = _utc_now_naive()
+    return json_response({"items": [_to_card(p, now) for p in posts], "next_cursor": next_cursor}, response)
 
 
 @router.post("/add")
@@ -167,69 +195,205 @@ class SocialBulkRequest(BaseModel):
     items: List[SocialBulkItem]
 
 
+# rows per INSERT statement in bulk_add (~10 bind params per row); matches SQLAlchemy's
+# insertmanyvalues page size, so each chunk is one round trip
+BULK_INSERT_CHUNK = 1000
+
+
+def _bulk_row(it: SocialBulkItem) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """(social_posts row, None) for a valid item, else (None, error code)."""
+    platform = (it.platform or "").strip().lower()
+    if platform not in ("x", "instagram"):
+        return None, "platform_must_be_x_or_instagram"
+
+    handle = (it.handle or "").strip().lstrip("@")
+    if not handle:
+        return None, "missing_handle"
+
+    permalink = (it.permalink or "").strip()
+    if not permalink:
+        return None, "missing_permalink"
+
+    created_at = it.created_at or _utc_now_naive()
+    return dict(
+        platform=platform,
+        handle=handle,
+        post_id=_derive_post_id(platform, permalink),
+        permalink=permalink,
+        text=it.text,
+        created_at=created_at,
+        media_urls=(it.media_urls or []),
+        metrics={},
+        source_tier=it.source_tier,
+        rank_score=_basic_rank(created_at),
+        created_db_at=_utc_now_naive(),
+    ), None
+
+
+def _insert_posts(db: Session, rows: List[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    INSERT ... ON CONFLICT DO NOTHING RETURNING, one statement per BULK_INSERT_CHUNK rows.
+    Rows must have distinct permalinks. Returns permalink -> id for the rows that landed.
+    No conflict target: rows hitting either unique index ((platform, post_id) or permalink)
+    are skipped, e.g. when a concurrent request stored the same post first.
+    """
+    # executemany form: SQLAlchemy batches it into multi-row INSERTs ("insertmanyvalues") from a
+    # cached statement, ~3x cheaper than compiling .values(rows) for every batch
+    stmt = pg_insert(SocialPost).on_conflict_do_nothing().returning(SocialPost.id, SocialPost.permalink)
+    new_ids: Dict[str, int] = {}
+    for start in range(0, len(rows), BULK_INSERT_CHUNK):
+        chunk = rows[start:start + BULK_INSERT_CHUNK]
+        new_ids.update({permalink: post_pk for post_pk, permalink in db.execute(stmt, chunk)})
+    return new_ids
+
+
 @router.post("/bulk_add")
 def social_bulk_add(
     payload: SocialBulkRequest,
     db: Session = Depends(get_db),
 ):
-    inserted = 0
-    skipped = 0
+    """
+    Validate and dedupe the payload in memory, then insert with
+    INSERT ... ON CONFLICT DO NOTHING RETURNING (one statement per BULK_INSERT_CHUNK rows).
+    `results` has one entry per payload item: inserted (with id), exists (already stored),
+    duplicate (repeats an earlier item of this payload) or error.
+    For large exports use /social/bulk_add_stream.
+    """
     errors: List[Dict[str, Any]] = []
-
-    for it in payload.items:
-        platform = (it.platform or "").strip().lower()
-        if platform not in ("x", "instagram"):
-            errors.append({"permalink": it.permalink, "error": "platform_must_be_x_or_instagram"})
-            skipped += 1
-            continue
-
-        handle = (it.handle or "").strip().lstrip("@")
-        if not handle:
-            errors.append({"permalink": it.permalink, "error": "missing_handle"})
-            skipped += 1
+    results: List[Dict[str, Any]] = []
+    rows: List[Dict[str, Any]] = []
+    first_index: Dict[str, int] = {}  # permalink -> index of its first item in the payload
+
+    for i, it in enumerate(payload.items):
+        result: Dict[str, Any] = {"index": i, "permalink": it.permalink}
+        results.append(result)
+
+        row, error = _bulk_row(it)
+        if error:
+            errors.append({"permalink": it.permalink, "error": error})
+            result.update(status="error", error=error)
             continue
 
-        permalink = (it.permalink or "").strip()
-        if not permalink:
-            errors.append({"permalink": it.permalink, "error": "missing_permalink"})
-            skipped += 1
+        # permalink is unique on its own (and post_id is derived from it), so it covers both unique indexes
+        if row["permalink"] in first_index:
+            result.update(status="duplicate", duplicate_of=first_index[row["permalink"]])
             continue
+        first_index[row["permalink"]] = i
+        rows.append(row)
 
-        created_at = it.created_at or _utc_now_naive()
-        post_id = _derive_post_id(platform, permalink)
-
-        exists = (
-            db.query(SocialPost.id)
-            .filter(SocialPost.platform == platform, SocialPost.post_id == post_id)
-            .first()
-        )
-        if exists:
-            skipped += 1
-            continue
-
-        sp = SocialPost(
-            platform=platform,
-            handle=handle,
-            post_id=post_id,
-            permalink=permalink,
-            text=it.text,
-            created_at=created_at,
-            media_urls=(it.media_urls or []),
-            metrics={},
-            source_tier=it.source_tier,
-            rank_score=_basic_rank(created_at),
-        )
-        db.add(sp)
-        inserted += 1
+    new_ids = _insert_posts(db, rows)
 
     # one commit for the whole batch
     db.commit()
 
+    for permalink, i in first_index.items():
+        if permalink in new_ids:
+            results[i].update(status="inserted", id=new_ids[permalink])
+        else:
+            results[i].update(status="exists")
+
+    inserted = len(new_ids)
     return {
         "ok": True,
         "inserted": inserted,
-        "skipped": skipped,
+        "skipped": len(payload.items) - inserted,
         "errors": errors,
         "total": len(payload.items),
+        "results": results,
     }
 
+
+def _write_stream_batch(db: Session, rows: List[Dict[str, Any]]) -> int:
+    try:
+        inserted = len(_insert_posts(db, rows))
+        db.commit()
+        return inserted
+    except Exception:
+        db.rollback()
+        raise
+
+
+@router.post("/bulk_add_stream")
+async def social_bulk_add_stream(
+    request: Request,
+    batch_size: int = Query(
+        default=settings.SOCIAL_STREAM_BATCH_SIZE, ge=1, le=BULK_INSERT_CHUNK, description="items per INSERT/commit"
+    ),
+):
+    """
+    NDJSON variant of bulk_add for large exports: one SocialBulkItem JSON object per line
+    (Content-Type: application/x-ndjson).
+
+    Lines are parsed and validated as they arrive and written in batches of `batch_size`,
+    each committed on its own, so memory stays flat however large the upload is. The
+    response is NDJSON too: one progress line per batch (with that batch's errors, by
+    line number) and a final {"done": true, ...} summary. Repeats are only detected
+    within a batch; a repeat in a later batch is skipped by the unique index as "exists".
+    """
+
+    async def progress():
+        db = SessionLocal()
+        lines = inserted = skipped = failed = batches = batch_items = 0
+        rows: List[Dict[str, Any]] = []
+        seen: set = set()  # permalinks in the current batch
+        errors: List[Dict[str, Any]] = []  # errors in the current batch
+
+        async def flush():
+            nonlocal inserted, skipped, failed, batches, batch_items
+            n = await run_in_threadpool(_write_stream_batch, db, rows) if rows else 0
+            batch_skipped = batch_items - n
+            inserted += n
+            skipped += batch_skipped
+            failed += len(errors)
+            batches += 1
+            batch_items = 0
+            line = ndjson_line({
+                "batch": batches,
+                "lines": lines,
+                "inserted": n,
+                "skipped": batch_skipped,
+                "errors": list(errors),
+            })
+            rows.clear()
+            seen.clear()
+            errors.clear()
+            return line
+
+        try:
+            async for lineno, raw in iter_lines(request.stream()):
+                lines = lineno
+                batch_items += 1
+                if raw is None:
+                    errors.append({"line": lineno, "error": "line_too_long"})
+                else:
+                    try:
+                        item = SocialBulkItem.model_validate_json(raw)
+                    except ValidationError as e:
+                        errors.append({"line": lineno, "error": "invalid_item", "detail": e.errors()[0]["msg"]})
+                    else:
+                        row, error = _bulk_row(item)
+                        if error:
+                            errors.append({"line": lineno, "permalink": item.permalink, "error": error})
+                        elif row["permalink"] not in seen:
+                            seen.add(row["permalink"])
+                            rows.append(row)
+
+                if batch_items >= batch_size:
+                    yield await flush()
+
+            if batch_items:
+                yield await flush()
+
+            yield ndjson_line({
+                "done": True,
+                "ok": True,
+                "lines": lines,
+                "batches": batches,
+                "inserted": inserted,
+                "skipped": skipped,
+                "errors": failed,
+            })
+        finally:
+            db.close()
+
+    return NDJSONResponse(progress())
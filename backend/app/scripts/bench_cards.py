@@ -0,0 +1,108 @@
+"""
+Benchmark the per-page cost of building and serializing feed cards.
+
+    python -m app.scripts.bench_cards
+    python -m app.scripts.bench_cards --limit 200 --repeat 50
+
+Times one page of --limit cards, stage by stage, three ways:
+
+- orm+json:    select(ContentItem) ORM instances, full cards, FastAPI's default rendering
+               (jsonable_encoder + json.dumps, as JSONResponse renders it)
+- rows+orjson: select(*CARD_COLUMNS) row tuples, full cards, responses.dumps() (orjson)
+- minimal:     as rows+orjson, with ?fields=minimal (card_columns(MINIMAL_CARD_FIELDS))
+
+Reports the best ms/page of --repeat runs per stage, the total, and the peak Python
+memory allocated while fetching + building one page (tracemalloc).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Tuple
+
+import sqlalchemy as sa
+from fastapi.encoders import jsonable_encoder
+
+from app.db import SessionLocal
+from app.models import ContentItem
+from app.responses import dumps
+from app.routes.feed import CARD_COLUMNS, CARD_FIELDS, MINIMAL_CARD_FIELDS, _to_card, card_columns
+
+
+def _best_ms(fn: Callable[[], Any], repeat: int) -> Tuple[float, Any]:
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000.0, out
+
+
+def _peak_kb(fn: Callable[[], Any]) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1024.0
+    finally:
+        tracemalloc.stop()
+
+
+def _stdlib_render(payload: Dict[str, Any]) -> bytes:
+    # what FastAPI does with a plain dict return value + JSONResponse.render
+    return json.dumps(
+        jsonable_encoder(payload), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--limit", type=int, default=200, help="cards per page (the /feed/top maximum)")
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        order = (ContentItem.rank_key.desc().nullslast(), ContentItem.id.desc())
+
+        def fetch_orm() -> List[Any]:
+            db.expunge_all()  # a fresh identity map per page, as in a request
+            return db.scalars(sa.select(ContentItem).order_by(*order).limit(args.limit)).all()
+
+        def fetch_columns(columns) -> Callable[[], List[Any]]:
+            return lambda: db.execute(sa.select(*columns).order_by(*order).limit(args.limit)).all()
+
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        variants = (
+            ("orm+json", fetch_orm, CARD_FIELDS, _stdlib_render),
+            ("rows+orjson", fetch_columns(CARD_COLUMNS), CARD_FIELDS, dumps),
+            ("minimal", fetch_columns(card_columns(MINIMAL_CARD_FIELDS)), MINIMAL_CARD_FIELDS, dumps),
+        )
+        results: Dict[str, Dict[str, float]] = {}
+        for name, fetch, fields, render in variants:
+            fetch_ms, rows = _best_ms(fetch, args.repeat)
+            build_ms, cards = _best_ms(lambda: [_to_card(r, now, fields) for r in rows], args.repeat)
+            payload = {"items": cards, "next_cursor": None}
+            render_ms, body = _best_ms(lambda: render(payload), args.repeat)
+            peak_kb = _peak_kb(lambda: [_to_card(r, now, fields) for r in fetch()])
+            results[name] = {"fetch": fetch_ms, "build": build_ms, "serialize": render_ms}
+            print(
+                f"[BENCH] {name:<11}: cards={len(cards)} bytes={len(body)} fetch={fetch_ms:.2f}ms "
+                f"build={build_ms:.2f}ms serialize={render_ms:.2f}ms total={sum(results[name].values()):.2f}ms/page "
+                f"peak={peak_kb:,.0f}KiB"
+            )
+            db.rollback()
+    finally:
+        db.close()
+
+    before = results["orm+json"]
+    for name in ("rows+orjson", "minimal"):
+        after = results[name]
+        speedups = " ".join(f"{stage}=x{before[stage] / after[stage]:.1f}" for stage in ("fetch", "build", "serialize"))
+        print(f"[BENCH] {name:<11} vs orm+json: {speedups} total=x{sum(before.values()) / sum(after.values()):.1f}")
+
+
+if __name__ == "__main__":
+    main()
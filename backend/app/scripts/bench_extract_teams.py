@@ -0,0 +1,120 @@
+"""
+Benchmark extract_teams() (token trie) against the previous per-alias regex scan.
+
+Uses real titles/snippets/urls from content_items by default:
+
+    python -m app.scripts.bench_extract_teams --limit 5000
+    python -m app.scripts.bench_extract_teams --file titles.txt   # one title per line
+
+Also checks that both implementations return identical output for every row.
+"""
+from __future__ import annotations
+
+import argparse
+import re
+import time
+from typing import List, Optional, Tuple
+
+from app.services.enrich import TEAM_ALIASES, _normalize_for_team_match, extract_teams
+
+
+# ---- previous implementation (one compiled regex per alias), kept as the reference ----
+
+def _alias_to_pattern(alias: str) -> re.Pattern:
+    a = _normalize_for_team_match(alias)
+    parts = [re.escape(p) for p in a.split() if p]
+    if not parts:
+        return re.compile(r"$^")
+    return re.compile(r"\b" + r"\s+".join(parts) + r"\b")
+
+
+_TEAM_PATTERNS: List[Tuple[re.Pattern, str]] = [
+    (_alias_to_pattern(alias), abbr) for alias, abbr in TEAM_ALIASES.items()
+]
+
+
+def extract_teams_regex(title: str, summary: str = "", url: Optional[str] = None) -> List[str]:
+    text = _normalize_for_team_match(f"{title or ''} {summary or ''} {url or ''}")
+    found: List[str] = []
+    for pat, abbr in _TEAM_PATTERNS:
+        if pat.search(text):
+            found.append(abbr)
+    valid_codes = set(TEAM_ALIASES.values())
+    for token in text.split():
+        if len(token) in (2, 3, 4):
+            code = token.upper()
+            if code in valid_codes:
+                found.append(code)
+    out: List[str] = []
+    for t in found:
+        if t not in out:
+            out.append(t)
+    return out
+
+
+# ---- corpus ----
+
+Row = Tuple[str, str, Optional[str]]
+
+
+def _load_db(limit: int) -> List[Row]:
+    from app.db import SessionLocal
+    from app.models import ContentItem
+
+    db = SessionLocal()
+    try:
+        rows = (
+            db.query(ContentItem.title, ContentItem.snippet, ContentItem.url)
+            .order_by(ContentItem.id.desc())
+            .limit(limit)
+            .all()
+        )
+        return [(t or "", s or "", u) for t, s, u in rows]
+    finally:
+        db.close()
+
+
+def _load_file(path: str) -> List[Row]:
+    with open(path, encoding="utf-8") as f:
+        return [(line.strip(), "", None) for line in f if line.strip()]
+
+
+def _time(fn, corpus: List[Row], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for title, snippet, url in corpus:
+            fn(title, snippet, url=url)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--limit", type=int, default=5000, help="rows to pull from content_items")
+    parser.add_argument("--file", default=None, help="read titles from a file instead of the DB")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    corpus = _load_file(args.file) if args.file else _load_db(args.limit)
+    if not corpus:
+        print("[BENCH] empty corpus (ingest something first or pass --file)")
+        return
+
+    mismatches = 0
+    for title, snippet, url in corpus:
+        if extract_teams(title, snippet, url=url) != extract_teams_regex(title, snippet, url=url):
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"[BENCH] MISMATCH title={title[:80]!r}")
+
+    old = _time(extract_teams_regex, corpus, args.repeat)
+    new = _time(extract_teams, corpus, args.repeat)
+    n = len(corpus)
+    print(f"[BENCH] rows={n} aliases={len(TEAM_ALIASES)} mismatches={mismatches}")
+    print(f"[BENCH] regex: {old * 1e6 / n:8.1f} us/row  ({n / old:,.0f} rows/s)")
+    print(f"[BENCH] trie : {new * 1e6 / n:8.1f} us/row  ({n / new:,.0f} rows/s)  speedup x{old / new:.1f}")
+
+
+if __name__ == "__main__":
+    main()
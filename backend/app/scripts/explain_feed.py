@@ -0,0 +1,86 @@
+"""
+EXPLAIN regression check for the /feed/top and /feed/breaking queries.
+
+Builds the exact statements the routes run and fails (exit code 1) if any plan
+contains a correlated SubPlan, i.e. if cluster sizing has regressed back into a
+per-row subquery evaluated before the LIMIT.
+
+    python -m app.scripts.explain_feed
+    python -m app.scripts.explain_feed --analyze --verbose
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, Iterator, List
+
+from sqlalchemy import event
+
+from app.db import engine
+from app.routes.feed import build_breaking_query, build_top_query
+
+CASES = {
+    "top": lambda: build_top_query(limit=50),
+    "top sport+team": lambda: build_top_query(sport="nba", team="LAL", limit=50),
+    "top topic+dups": lambda: build_top_query(topic="trade", include_duplicates=True, limit=200),
+    "breaking": lambda: build_breaking_query(limit=50),
+    "breaking sport": lambda: build_breaking_query(sport="nfl", min_urgency=0.5, limit=200),
+}
+
+
+def _nodes(plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _nodes(child)
+
+
+def explain(stmt, analyze: bool = False) -> Dict[str, Any]:
+    prefix = "EXPLAIN (ANALYZE, FORMAT JSON) " if analyze else "EXPLAIN (FORMAT JSON) "
+
+    def _explain(conn, cursor, statement, parameters, context, executemany):
+        return prefix + statement, parameters
+
+    with engine.connect() as conn:
+        # Let SQLAlchemy compile + bind the statement as usual, then EXPLAIN it at the cursor
+        event.listen(conn, "before_cursor_execute", _explain, retval=True)
+        try:
+            raw = conn.execute(stmt).scalar()
+        finally:
+            event.remove(conn, "before_cursor_execute", _explain)
+            conn.rollback()
+
+    doc = raw if isinstance(raw, list) else json.loads(raw)
+    return doc[0]
+
+
+def check(name: str, doc: Dict[str, Any], verbose: bool = False) -> List[str]:
+    problems = []
+    for node in _nodes(doc["Plan"]):
+        if node.get("Parent Relationship") == "SubPlan":
+            problems.append(f"{name}: correlated {node.get('Subplan Name') or 'SubPlan'} ({node['Node Type']})")
+
+    timing = f" exec={doc['Execution Time']:.2f}ms" if "Execution Time" in doc else ""
+    print(f"[EXPLAIN] {name}: cost={doc['Plan']['Total Cost']:.1f}{timing} {'FAIL' if problems else 'ok'}")
+    if verbose:
+        print(json.dumps(doc["Plan"], indent=2))
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EXPLAIN regression check for the feed queries.")
+    parser.add_argument("--analyze", action="store_true", help="run EXPLAIN ANALYZE (executes the queries)")
+    parser.add_argument("--verbose", action="store_true", help="print full plans")
+    args = parser.parse_args()
+
+    problems: List[str] = []
+    for name, build in CASES.items():
+        problems += check(name, explain(build(), analyze=args.analyze), verbose=args.verbose)
+
+    for p in problems:
+        print(f"[EXPLAIN] REGRESSION {p}")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
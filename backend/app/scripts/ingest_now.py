@@ -1,28 +1,67 @@
+import argparse
+import asyncio
 from datetime import datetime
 
 from app.db import SessionLocal
 from app.models import IngestRun, ContentItem
-from app.services.run_ingest import run_all
+from app.services.run_ingest import run_all, run_all_async
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Fetch all configured feeds and store new items.")
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="fetch feeds concurrently (httpx.AsyncClient) instead of one at a time",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help="rows per bulk INSERT (default: INGEST_BATCH_SIZE)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="enrichment worker processes, 0/1 = inline (default: INGEST_ENRICH_WORKERS)",
+    )
+    args = parser.parse_args()
+
     db = SessionLocal()
-    run = IngestRun(status="running", started_at=datetime.utcnow(), inserted_count=0)
+    run = IngestRun(
+        status="running",
+        started_at=datetime.utcnow(),
+        inserted_count=0,
+        not_modified_count=0,
+        unchanged_count=0,
+        skipped_count=0,
+    )
 
     try:
         db.add(run)
         db.commit()
         db.refresh(run)
 
-        inserted = run_all(db)
+        if args.use_async:
+            stats = asyncio.run(run_all_async(db, batch_size=args.batch_size, workers=args.workers))
+        else:
+            stats = run_all(db, batch_size=args.batch_size, workers=args.workers)
+        inserted = stats.inserted
 
         run.status = "success"
         run.inserted_count = int(inserted)
+        run.not_modified_count = stats.not_modified
+        run.unchanged_count = stats.unchanged
+        run.skipped_count = stats.skipped
+        run.batch_stats = stats.batches
         run.finished_at = datetime.utcnow()
         run.error = None
         db.commit()
 
-        print(f"Inserted {inserted} items.")
+        print(f"Inserted {inserted} items. (not_modified={stats.not_modified} unchanged={stats.unchanged} "
+              f"skipped={stats.skipped} batches={len(stats.batches)})")
 
         # Optional: print a small sanity sample so you can confirm enrichment fields are populated
         sample = (
@@ -0,0 +1,117 @@
+"""
+Concurrent-client load test for the read endpoints.
+
+    uvicorn app.main:app --port 8000 &
+    python -m app.scripts.loadtest --url http://127.0.0.1:8000 --concurrency 200 --duration 20
+
+Each of --concurrency clients loops over --paths (round robin, starting at a different
+offset) for --duration seconds. Reports requests/sec and latency percentiles per path
+and overall; any non-2xx/304 response or transport error counts as an error.
+
+To compare two builds, start each on its own port and run the same command against both.
+Set RESPONSE_CACHE_TTL_SECONDS=0 on the server to measure the database path instead of
+the in-process response cache.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+import httpx
+
+DEFAULT_PATHS = [
+    "/feed/top?limit=50",
+    "/feed/breaking?limit=50&min_urgency=0.5",
+    "/news?limit=50",
+    "/news?q=trade&limit=20",
+    "/meta/sports",
+]
+
+
+def _pct(sorted_ms: List[float], p: float) -> float:
+    if not sorted_ms:
+        return 0.0
+    return sorted_ms[min(len(sorted_ms) - 1, int(round(p / 100.0 * (len(sorted_ms) - 1))))]
+
+
+async def _client(
+    http: httpx.AsyncClient,
+    paths: List[str],
+    offset: int,
+    deadline: float,
+    latencies: Dict[str, List[float]],
+    errors: Dict[str, int],
+) -> None:
+    i = offset
+    while time.perf_counter() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        t0 = time.perf_counter()
+        try:
+            resp = await http.get(path)
+            ok = resp.status_code < 300 or resp.status_code == 304
+        except httpx.HTTPError:
+            ok = False
+        latencies[path].append((time.perf_counter() - t0) * 1000.0)
+        if not ok:
+            errors[path] += 1
+
+
+def _row(label: str, ms: List[float], errors: int, seconds: float) -> str:
+    ms = sorted(ms)
+    return (
+        f"{label:<44} {len(ms):>7} {len(ms) / seconds:>8.1f} {errors:>6} "
+        f"{_pct(ms, 50):>8.1f} {_pct(ms, 95):>8.1f} {_pct(ms, 99):>8.1f} {(ms[-1] if ms else 0.0):>8.1f}"
+    )
+
+
+async def run(url: str, paths: List[str], concurrency: int, duration: float, timeout: float) -> None:
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=timeout) as http:
+        # warm-up: one pass so connection setup and first-query plans aren't in the numbers
+        for path in paths:
+            await http.get(path)
+
+        start = time.perf_counter()
+        deadline = start + duration
+        await asyncio.gather(*(
+            _client(http, paths, offset, deadline, latencies, errors) for offset in range(concurrency)
+        ))
+        seconds = time.perf_counter() - start
+
+    print(f"[LOAD] {url} concurrency={concurrency} duration={seconds:.1f}s")
+    print(f"{'path':<44} {'reqs':>7} {'req/s':>8} {'errors':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for path in paths:
+        print(_row(path, latencies[path], errors[path], seconds))
+    everything = [ms for path in paths for ms in latencies[path]]
+    print(_row("TOTAL", everything, sum(errors.values()), seconds))
+    if everything:
+        print(f"[LOAD] mean latency {statistics.fmean(everything):.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the read endpoints with many concurrent clients.")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="API base url")
+    parser.add_argument("--concurrency", type=int, default=200, help="concurrent clients")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds to run")
+    parser.add_argument("--timeout", type=float, default=30.0, help="per-request timeout (seconds)")
+    parser.add_argument(
+        "--paths",
+        default=",".join(DEFAULT_PATHS),
+        help="comma-separated request paths (default: feed/top, feed/breaking, news, news search, meta/sports)",
+    )
+    args = parser.parse_args()
+
+    paths = [p.strip() for p in args.paths.split(",") if p.strip()]
+    asyncio.run(run(args.url, paths, args.concurrency, args.duration, args.timeout))
+
+
+if __name__ == "__main__":
+    main()
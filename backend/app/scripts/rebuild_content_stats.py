@@ -0,0 +1,29 @@
+"""
+Recompute the content_stats rollup from content_items.
+
+Ingestion keeps the rollup current on its own; run this after changing content_items
+outside the ingest writer (deletes, sport/source re-tagging, manual fixes):
+
+    python -m app.scripts.rebuild_content_stats
+"""
+from __future__ import annotations
+
+from app.cache import bump_generation
+from app.db import SessionLocal
+from app.models import ContentStat
+from app.services.content_stats import rebuild_content_stats
+
+
+def main():
+    db = SessionLocal()
+    try:
+        rebuild_content_stats(db)
+        bump_generation(db)  # /meta/sports responses are cached
+        db.commit()
+        print(f"[STATS] rebuilt content_stats: {db.query(ContentStat).count()} rows")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Recompute topics, source tier, urgency and rank for rows enriched under an older
+enrich.ENRICH_VERSION (bump the constant after changing TOPIC_RULES, source_tier or
+the rank formulas):
+
+    python -m app.scripts.reenrich --workers 4
+
+Only stale rows are read and written, in id-ordered batches that each commit on their
+own, so it is safe to run while ingestion is live. Progress is checkpointed per
+version; an interrupted run resumes where it stopped.
+"""
+from __future__ import annotations
+
+import argparse
+
+from app.db import SessionLocal
+from app.services.backfill import REENRICH_JOB, run_backfill
+from app.services.enrich import ENRICH_VERSION
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-enrich content items written under an older rule version.")
+    parser.add_argument("--workers", type=int, default=0, help="worker processes, 0/1 = inline")
+    parser.add_argument("--batch-size", type=int, default=1000, help="rows per page / UPDATE / commit")
+    parser.add_argument("--max-rows", type=int, default=None, help="stop after scanning about this many rows")
+    parser.add_argument("--restart", action="store_true", help="ignore the saved checkpoint and start from the first row")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        print(f"[REENRICH] target enrich_version={ENRICH_VERSION}")
+        run_backfill(
+            db,
+            REENRICH_JOB,
+            batch_size=args.batch_size,
+            workers=args.workers,
+            restart=args.restart,
+            max_rows=args.max_rows,
+        )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
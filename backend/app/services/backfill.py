@@ -0,0 +1,313 @@
+"""
+Resumable, parallel backfill engine for content_items.
+
+A BackfillJob says which columns to read, which rows qualify, a pure `compute` function
+(rows -> updates) and the column types of the update. run_backfill() then:
+
+- pages through the table in id order (`id > last_id ORDER BY id LIMIT batch_size`),
+  selecting only the job's columns
+- fans each page out to worker processes (EnrichmentPool.submit) and reads the next page
+  while they compute
+- writes every changed row of a page with one `UPDATE ... FROM (VALUES ...)`
+- commits the page together with its checkpoint (backfill_checkpoints.last_id), so an
+  interrupted run resumes after the last committed page instead of starting over
+- prints rows/sec per page and for the whole run
+
+Jobs in this module: "backfill_teams" (fill empty teams), "retag_teams" (recompute
+teams for every row, e.g. after TEAM_ALIASES changes) and "reenrich_v<N>" (recompute
+topics / tier / urgency / rank for rows older than enrich.ENRICH_VERSION).
+
+Every page is its own short transaction that only touches the rows it read, so jobs
+can run next to live ingestion: new rows are inserted, never updated, by the ingester.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.cache import bump_generation
+from app.models import BackfillCheckpoint, ContentItem
+from app.services.enrich import (
+    ENRICH_VERSION,
+    classify_topics,
+    compute_rank_base,
+    compute_rank_key,
+    compute_rank_score,
+    compute_urgency,
+    extract_teams,
+    source_tier,
+    topic_urgency_bump,
+)
+from app.services.enrich_stage import EnrichmentPool
+
+Row = Tuple[Any, ...]  # (id, *job.columns)
+Update = Dict[str, Any]  # {"id": ..., <column>: <new value>, ...}
+
+
+@dataclass(frozen=True)
+class BackfillJob:
+    name: str  # checkpoint key
+    columns: Sequence[Any]  # read after ContentItem.id
+    compute: Callable[[List[Row]], List[Optional[Update]]]  # module-level (picklable); None = no change
+    update_types: Dict[str, Any]  # column name -> SQL type for the VALUES list
+    where: Optional[Any] = None  # extra row filter
+
+
+@dataclass
+class BackfillResult:
+    scanned: int = 0
+    updated: int = 0
+    last_id: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.scanned / self.seconds if self.seconds else 0.0
+
+
+# ----------------------------
+# checkpoints
+# ----------------------------
+
+def load_checkpoint(db: Session, name: str, restart: bool = False) -> BackfillCheckpoint:
+    """The job's checkpoint row; a finished (or restarted) job starts again from id 0."""
+    cp = db.get(BackfillCheckpoint, name)
+    if cp is None:
+        cp = BackfillCheckpoint(name=name, last_id=0, scanned=0, updated=0)
+        db.add(cp)
+    if restart or cp.finished_at is not None:
+        cp.last_id, cp.scanned, cp.updated, cp.finished_at = 0, 0, 0, None
+    if cp.last_id == 0:
+        cp.started_at = datetime.utcnow()
+    cp.updated_at = datetime.utcnow()
+    db.commit()
+    return cp
+
+
+# ----------------------------
+# engine
+# ----------------------------
+
+def _read_page(db: Session, job: BackfillJob, after_id: int, batch_size: int) -> List[Row]:
+    stmt = sa.select(ContentItem.id, *job.columns).where(ContentItem.id > after_id)
+    if job.where is not None:
+        stmt = stmt.where(job.where)
+    return [tuple(r) for r in db.execute(stmt.order_by(ContentItem.id).limit(batch_size))]
+
+
+def bulk_update(db: Session, updates: List[Update], update_types: Dict[str, Any]) -> int:
+    """UPDATE content_items SET col = v.col ... FROM (VALUES (...), ...) AS v WHERE id = v.id"""
+    if not updates:
+        return 0
+    names = list(update_types)
+    values = sa.values(
+        sa.column("id", sa.Integer),
+        *(sa.column(n, update_types[n]) for n in names),
+        name="v",
+    ).data([(u["id"], *(u[n] for n in names)) for u in updates])
+    stmt = (
+        sa.update(ContentItem)
+        .where(ContentItem.id == values.c.id)
+        # VALUES columns are typed from their literals ('{}' / JSON text come in as text): cast back
+        .values({n: sa.cast(values.c[n], update_types[n]) for n in names})
+    )
+    return db.execute(stmt).rowcount
+
+
+def run_backfill(
+    db: Session,
+    job: BackfillJob,
+    batch_size: int = 1000,
+    workers: int = 0,
+    restart: bool = False,
+    max_rows: Optional[int] = None,
+) -> BackfillResult:
+    cp = load_checkpoint(db, job.name, restart=restart)
+    if cp.last_id:
+        print(f"[BACKFILL] {job.name}: resuming after id={cp.last_id} (scanned={cp.scanned} updated={cp.updated})")
+
+    result = BackfillResult(last_id=cp.last_id)
+    t_start = time.perf_counter()
+    with EnrichmentPool(workers, chunk_size=max(1, batch_size // max(workers, 1))) as pool:
+        page = _read_page(db, job, cp.last_id, batch_size)
+        while page:
+            t_page = time.perf_counter()
+            pending = pool.submit(job.compute, page)
+
+            # overlap: read the next page while workers compute this one
+            next_page = _read_page(db, job, page[-1][0], batch_size)
+
+            updates = [u for u in pending() if u is not None]
+            changed = bulk_update(db, updates, job.update_types)
+
+            cp.last_id = page[-1][0]
+            cp.scanned += len(page)
+            cp.updated += changed
+            cp.updated_at = datetime.utcnow()
+            if changed:
+                bump_generation(db)  # cached feed responses may show the old values
+            db.commit()
+
+            result.scanned += len(page)
+            result.updated += changed
+            result.last_id = cp.last_id
+            dt = time.perf_counter() - t_page
+            print(
+                f"[BACKFILL] {job.name}: last_id={cp.last_id} page={len(page)} updated={changed} "
+                f"({len(page) / dt:,.0f} rows/s) total scanned={cp.scanned} updated={cp.updated}"
+            )
+
+            if max_rows is not None and result.scanned >= max_rows:
+                print(f"[BACKFILL] {job.name}: reached max_rows={max_rows}; rerun to resume")
+                break
+            page = next_page
+        else:
+            cp.finished_at = datetime.utcnow()
+            db.commit()
+
+    result.seconds = time.perf_counter() - t_start
+    print(
+        f"[BACKFILL] {job.name}: {'DONE' if cp.finished_at else 'PAUSED'} scanned={result.scanned} "
+        f"updated={result.updated} in {result.seconds:.1f}s ({result.rows_per_sec:,.0f} rows/s)"
+    )
+    return result
+
+
+# ----------------------------
+# team jobs
+# ----------------------------
+
+def _entities_teams(entities: Any) -> List[str]:
+    if not isinstance(entities, dict):
+        return []
+    t = entities.get("teams", [])
+    if isinstance(t, list):
+        return [str(x) for x in t if x]
+    return []
+
+
+def _entities_with_teams(entities: Any, teams: List[str]) -> Dict[str, Any]:
+    base: Dict[str, Any] = dict(entities) if isinstance(entities, dict) else {}
+    base["teams"] = teams
+    base.setdefault("players", [])
+    base.setdefault("leagues", [])
+    return base
+
+
+def fill_teams_chunk(rows: List[Row]) -> List[Optional[Update]]:
+    """Fill empty teams / entities.teams (never overwrites existing values)."""
+    out: List[Optional[Update]] = []
+    for item_id, title, snippet, summary, url, teams, entities in rows:
+        new_teams = extract_teams(title or "", snippet or summary or "", url=url)
+        col_empty = not teams
+        ent_empty = not _entities_teams(entities)
+        if not new_teams or not (col_empty or ent_empty):
+            out.append(None)
+            continue
+        out.append({
+            "id": item_id,
+            "teams": new_teams if col_empty else list(teams),
+            "entities": _entities_with_teams(entities, new_teams) if ent_empty else entities,
+        })
+    return out
+
+
+def retag_teams_chunk(rows: List[Row]) -> List[Optional[Update]]:
+    """Recompute teams for every row with the current TEAM_ALIASES; only changed rows are written."""
+    out: List[Optional[Update]] = []
+    for item_id, title, snippet, summary, url, teams, entities in rows:
+        new_teams = extract_teams(title or "", snippet or summary or "", url=url)
+        if list(teams or []) == new_teams and _entities_teams(entities) == new_teams:
+            out.append(None)
+            continue
+        out.append({"id": item_id, "teams": new_teams, "entities": _entities_with_teams(entities, new_teams)})
+    return out
+
+
+_TEAM_COLUMNS = (
+    ContentItem.title, ContentItem.snippet, ContentItem.summary, ContentItem.url, ContentItem.teams, ContentItem.entities
+)
+_TEAM_UPDATE_TYPES = {"teams": postgresql.ARRAY(sa.Text), "entities": postgresql.JSONB()}
+
+FILL_TEAMS_JOB = BackfillJob(
+    name="backfill_teams",
+    columns=_TEAM_COLUMNS,
+    compute=fill_teams_chunk,
+    update_types=_TEAM_UPDATE_TYPES,
+    where=sa.or_(
+        # teams array missing or empty
+        sa.func.coalesce(sa.func.cardinality(ContentItem.teams), 0) == 0,
+        # entities missing or entities.teams missing/empty
+        ContentItem.entities.is_(None),
+        sa.func.coalesce(sa.func.jsonb_array_length(ContentItem.entities["teams"]), 0) == 0,
+    ),
+)
+
+RETAG_TEAMS_JOB = BackfillJob(
+    name="retag_teams",
+    columns=_TEAM_COLUMNS,
+    compute=retag_teams_chunk,
+    update_types=_TEAM_UPDATE_TYPES,
+)
+
+
+# ----------------------------
+# re-enrichment
+# ----------------------------
+
+def reenrich_chunk(rows: List[Row]) -> List[Optional[Update]]:
+    """
+    Recompute the rule-derived fields exactly as enrich_entry / ingest_response do.
+    urgency and rank_score are snapshots at ingest time, so they are recomputed as of
+    created_at rather than now.
+    """
+    out: List[Optional[Update]] = []
+    for item_id, source, title, snippet, published_at, created_at, is_duplicate in rows:
+        topics = classify_topics(title or "", (snippet or "").strip())
+        tier = source_tier(source)
+        urgency = compute_urgency(published_at, topics, now=created_at)
+        rank_base = compute_rank_base(tier, topics, bool(is_duplicate))
+        out.append({
+            "id": item_id,
+            "topics": topics,
+            "source_tier": tier,
+            "urgency": urgency,
+            "urgency_bump": topic_urgency_bump(topics),
+            "rank_score": compute_rank_score(published_at, tier, urgency, bool(is_duplicate), now=created_at),
+            "rank_base": rank_base,
+            "rank_key": compute_rank_key(rank_base, published_at),
+            "enrich_version": ENRICH_VERSION,
+        })
+    return out
+
+
+# checkpoint per version: bumping ENRICH_VERSION mid-run starts the new version from id 0
+REENRICH_JOB = BackfillJob(
+    name=f"reenrich_v{ENRICH_VERSION}",
+    columns=(
+        ContentItem.source,
+        ContentItem.title,
+        ContentItem.snippet,
+        ContentItem.published_at,
+        ContentItem.created_at,
+        ContentItem.is_duplicate,
+    ),
+    compute=reenrich_chunk,
+    update_types={
+        "topics": postgresql.ARRAY(sa.Text),
+        "source_tier": sa.Integer(),
+        "urgency": sa.Float(),
+        "urgency_bump": sa.Float(),
+        "rank_score": sa.Float(),
+        "rank_base": sa.Float(),
+        "rank_key": sa.Float(),
+        "enrich_version": sa.Integer(),
+    },
+    where=ContentItem.enrich_version < ENRICH_VERSION,
+)
@@ -0,0 +1,78 @@
+"""
+content_stats rollup: per-sport / per-source row counts and last published_at.
+
+/meta/sports and /meta/health read this table (one row per sport/source) instead of
+aggregating content_items on every request. It is maintained incrementally by the
+ingest writer (record_inserted, inside the same transaction as the INSERT, fed from
+its RETURNING rows) and can be rebuilt from scratch with rebuild_content_stats()
+(`python -m app.scripts.rebuild_content_stats`) after bulk edits such as re-tagging.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models import ContentStat
+
+# kind -> which content_items column the key comes from; "all" has a single "*" row
+STAT_KINDS = ("sport", "source", "all")
+ALL_KEY = "*"
+
+REBUILD_SQL = """
+INSERT INTO content_stats (kind, key, count, last_published_at)
+SELECT 'sport', sport, count(*), max(published_at) FROM content_items GROUP BY sport
+UNION ALL
+SELECT 'source', source, count(*), max(published_at) FROM content_items GROUP BY source
+UNION ALL
+SELECT 'all', '*', count(*), max(published_at) FROM content_items
+"""
+
+
+def _rollup(rows: Iterable[Tuple[str, str, Optional[datetime]]]) -> Dict[Tuple[str, str], List]:
+    out: Dict[Tuple[str, str], List] = defaultdict(lambda: [0, None])
+    for sport, source, published_at in rows:
+        for key in (("sport", sport), ("source", source), ("all", ALL_KEY)):
+            acc = out[key]
+            acc[0] += 1
+            if published_at is not None and (acc[1] is None or published_at > acc[1]):
+                acc[1] = published_at
+    return out
+
+
+def record_inserted(db: Session, rows: Iterable[Tuple[str, str, Optional[datetime]]]) -> None:
+    """Add freshly inserted (sport, source, published_at) rows to the rollup; caller commits."""
+    rollup = _rollup(rows)
+    if not rollup:
+        return
+    stmt = pg_insert(ContentStat).values(
+        [
+            {"kind": kind, "key": key, "count": count, "last_published_at": last}
+            for (kind, key), (count, last) in sorted(rollup.items())  # stable lock order
+        ]
+    )
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[ContentStat.kind, ContentStat.key],
+            set_={
+                "count": ContentStat.count + stmt.excluded.count,
+                "last_published_at": sa.func.greatest(ContentStat.last_published_at, stmt.excluded.last_published_at),
+            },
+        )
+    )
+
+
+def rebuild_content_stats(db: Session) -> None:
+    """Recompute the whole rollup from content_items (O(rows)); caller commits."""
+    db.execute(sa.delete(ContentStat))
+    db.execute(sa.text(REBUILD_SQL))
+
+
+async def load_stats(db: AsyncSession, kind: str) -> List[ContentStat]:
+    stmt = sa.select(ContentStat).where(ContentStat.kind == kind).order_by(ContentStat.key)
+    return list((await db.scalars(stmt)).all())
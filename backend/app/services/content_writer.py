@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.models import ContentItem
+from app.services.content_stats import record_inserted
+from app.settings import settings
+
+
+def insert_content_rows(db: Session, rows: List[Dict[str, Any]]) -> List[str]:
+    """
+    Bulk insert enriched rows; URLs that already exist (e.g. a concurrent run got
+    there first) are skipped by the unique index instead of failing the batch.
+    The rows that did land are added to the content_stats rollup in the same transaction.
+    Returns the urls of the rows actually inserted.
+    """
+    if not rows:
+        return []
+    stmt = (
+        pg_insert(ContentItem)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=[ContentItem.url])
+        .returning(ContentItem.url, ContentItem.sport, ContentItem.source, ContentItem.published_at)
+    )
+    inserted = db.execute(stmt).all()
+    record_inserted(db, [(sport, source, published_at) for _, sport, source, published_at in inserted])
+    return [url for url, _, _, _ in inserted]
+
+
+@dataclass
+class BatchReport:
+    rows: int
+    inserted: int
+
+    @property
+    def skipped(self) -> int:
+        return self.rows - self.inserted
+
+    def as_dict(self) -> Dict[str, int]:
+        return {"rows": self.rows, "inserted": self.inserted, "skipped": self.skipped}
+
+
+@dataclass
+class ContentWriter:
+    """
+    Writer stage of the ingest pipeline.
+
+    Enriched rows are queued as plain dicts and written with one multi-row
+    INSERT ... ON CONFLICT DO NOTHING per `batch_size` rows. Nothing is committed
+    here; the caller owns the transaction (ingest_response commits once per feed,
+    together with the feed's conditional-GET validators).
+    """
+
+    db: Session
+    batch_size: int = field(default_factory=lambda: settings.INGEST_BATCH_SIZE)
+    pending: List[Dict[str, Any]] = field(default_factory=list)
+    batches: List[BatchReport] = field(default_factory=list)
+    uncommitted_urls: List[str] = field(default_factory=list)  # inserted since the last mark_committed()
+    _committed: int = 0  # batches[:_committed] are known to be committed
+
+    @property
+    def inserted(self) -> int:
+        return sum(b.inserted for b in self.batches)
+
+    @property
+    def skipped(self) -> int:
+        return sum(b.skipped for b in self.batches)
+
+    def add(self, row: Dict[str, Any]) -> None:
+        self.pending.append(row)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> Optional[BatchReport]:
+        if not self.pending:
+            return None
+        rows, self.pending = self.pending, []
+        urls = insert_content_rows(self.db, rows)
+        report = BatchReport(rows=len(rows), inserted=len(urls))
+        self.batches.append(report)
+        self.uncommitted_urls.extend(urls)
+        return report
+
+    def mark_committed(self) -> None:
+        self._committed = len(self.batches)
+        self.uncommitted_urls = []
+
+    def discard_uncommitted(self) -> None:
+        """Call after a rollback so the batch reports only describe rows that were kept."""
+        self.pending = []
+        self.uncommitted_urls = []
+        del self.batches[self._committed:]
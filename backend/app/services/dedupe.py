@@ -0,0 +1,310 @@
+"""
+Near-duplicate story clustering (MinHash + LSH).
+
+make_dedupe_group_id() only groups headlines whose normalized text hashes to the
+same SHA-1, so "Lakers acquire guard in three-team trade with Jazz and Nets" (ESPN)
+and "Jazz, Nets and Lakers agree to three-team trade" (Yahoo) never meet.
+
+StoryClusterer keeps the recent window of stories in memory:
+
+- each story becomes a shingle set (title words + title bigrams + leading snippet words,
+  stopwords dropped, light plural stemming)
+- a NUM_PERM MinHash signature is split into LSH_BANDS bands; stories sharing any band
+  bucket are candidates, so a lookup touches a handful of buckets instead of every row
+- candidates are confirmed with the exact Jaccard similarity of the shingle sets
+  (>= SIMILARITY_THRESHOLD) and the closest one wins; stories that both name teams
+  but share none are never merged ("Bruins acquire ... in trade" vs "Yankees acquire ... in trade")
+
+A matched story joins that cluster (its dedupe_group_id / canonical_id); otherwise it
+starts a new cluster keyed by make_dedupe_group_id() of its own title, so the ids
+keep the existing format and exact repeats of old stories still collide on the hash.
+
+assign() only stages a story: it is matchable right away (so near-duplicates within
+one feed cluster together), but it stays in the index only if its row was committed.
+After the commit, commit_staged(inserted urls) keeps the stories whose INSERT returned a
+row and drops the rest (ON CONFLICT skips); after a rollback, discard_staged() drops them all.
+"""
+from __future__ import annotations
+
+import hashlib
+import random
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Collection, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from app.models import ContentItem
+from app.services.enrich import _utc_now, make_canonical_id, make_dedupe_group_id
+
+NUM_PERM = 64
+LSH_BANDS = 32  # 2 rows per band: candidate probability ~87% at Jaccard 0.25, ~98% at 0.35
+SIMILARITY_THRESHOLD = 0.25
+WINDOW_HOURS = 72
+SNIPPET_TOKENS = 12
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have he his in into is it its of on or "
+    "our s said sources that the their this to vs was were will with after ahead "
+    "against amid over than up".split()
+)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+Signature = Tuple[int, ...]
+
+
+def _tokens(text: str) -> List[str]:
+    out = []
+    for tok in _TOKEN_RE.findall((text or "").lower()):
+        if tok in STOPWORDS:
+            continue
+        if len(tok) > 3 and tok.endswith("s") and not tok.endswith("ss"):
+            tok = tok[:-1]  # lakers/laker, trades/trade, homers/homer
+        out.append(tok)
+    return out
+
+
+def shingles(title: str, snippet: Optional[str] = "") -> FrozenSet[str]:
+    title_toks = _tokens(title)
+    out = set(title_toks)
+    out.update(f"{a} {b}" for a, b in zip(title_toks, title_toks[1:]))
+    out.update(_tokens(snippet or "")[:SNIPPET_TOKENS])
+    return frozenset(out)
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def teams_compatible(a: FrozenSet[str], b: FrozenSet[str]) -> bool:
+    return not a or not b or bool(a & b)
+
+
+def _hash64(s: str) -> int:
+    return int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class MinHasher:
+    """
+    NUM_PERM hash functions h_i(x) = blake2b64(x) XOR mask_i.
+    The base hash is already uniform, so XOR-ing with random masks gives independent
+    enough minima for LSH at a fraction of the cost of (a*x + b) mod p arithmetic.
+    """
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1):
+        rng = random.Random(seed)
+        self.masks = [rng.getrandbits(64) for _ in range(num_perm)]
+
+    def signature(self, shingle_set: Iterable[str]) -> Optional[Signature]:
+        hashes = [_hash64(s) for s in shingle_set]
+        if not hashes:
+            return None
+        return tuple(min([h ^ m for h in hashes]) for m in self.masks)
+
+
+@dataclass
+class ClusterMatch:
+    dedupe_group_id: str
+    canonical_id: str
+    matched: bool  # joined a cluster already in the window
+    similarity: float = 0.0
+
+
+@dataclass(eq=False)  # identity semantics: buckets remove exactly this story
+class _Story:
+    shingles: FrozenSet[str]
+    teams: FrozenSet[str]
+    published_at: Optional[datetime]
+    dedupe_group_id: str
+    canonical_id: str
+    bucket_keys: List[Tuple[int, int]] = field(default_factory=list)
+    key: Optional[str] = None  # staged stories: the row's url
+
+
+class StoryClusterer:
+    """
+    In-memory banded LSH index over the recent window of stories.
+
+    One instance per ingest run (see run_ingest.run_all / run_all_async), warmed from
+    content_items with load_recent(); assign() matches a new story and stages it in the
+    index until commit_staged() / discard_staged().
+    """
+
+    def __init__(
+        self,
+        window_hours: float = WINDOW_HOURS,
+        threshold: float = SIMILARITY_THRESHOLD,
+        num_perm: int = NUM_PERM,
+        bands: int = LSH_BANDS,
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.window = timedelta(hours=window_hours)
+        self.threshold = threshold
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        self.hasher = MinHasher(num_perm)
+        self.buckets: Dict[Tuple[int, int], List[_Story]] = defaultdict(list)
+        self.stories: List[_Story] = []
+        self.newest: Optional[datetime] = None
+        self._adds_since_evict = 0
+        self._staged: List[_Story] = []
+
+    def __len__(self) -> int:
+        return len(self.stories)
+
+    # ----------------------------
+    # index maintenance
+    # ----------------------------
+    def _bucket_keys(self, sig: Signature) -> List[Tuple[int, int]]:
+        r = self.rows_per_band
+        return [(band, hash(sig[band * r:(band + 1) * r])) for band in range(self.bands)]
+
+    def _index(self, story: _Story, sig: Optional[Signature]) -> None:
+        if sig is not None:
+            story.bucket_keys = self._bucket_keys(sig)
+            for key in story.bucket_keys:
+                self.buckets[key].append(story)
+        self.stories.append(story)
+        if story.published_at and (self.newest is None or story.published_at > self.newest):
+            self.newest = story.published_at
+
+        self._adds_since_evict += 1
+        if self._adds_since_evict >= 1000:
+            self.evict()
+
+    def _unbucket(self, story: _Story) -> None:
+        for key in story.bucket_keys:
+            bucket = self.buckets.get(key)
+            if bucket is not None and story in bucket:
+                bucket.remove(story)
+                if not bucket:
+                    del self.buckets[key]
+
+    def _drop(self, stories: List[_Story]) -> int:
+        if not stories:
+            return 0
+        for story in stories:
+            self._unbucket(story)
+        dropped = {id(s) for s in stories}
+        before = len(self.stories)
+        self.stories = [s for s in self.stories if id(s) not in dropped]
+        return before - len(self.stories)
+
+    def evict(self, now: Optional[datetime] = None) -> int:
+        """Drop stories older than the window (relative to `now` or the newest story seen)."""
+        self._adds_since_evict = 0
+        ref = now or self.newest
+        if ref is None:
+            return 0
+        cutoff = ref - self.window
+        return self._drop([s for s in self.stories if s.published_at is not None and s.published_at < cutoff])
+
+    def commit_staged(self, kept_keys: Collection[str]) -> int:
+        """Keep the staged stories whose row was inserted (keys = urls); drop the others. Returns #dropped."""
+        staged, self._staged = self._staged, []
+        return self._drop([s for s in staged if s.key not in kept_keys])
+
+    def discard_staged(self) -> int:
+        """Drop every staged story (the transaction that would have inserted them rolled back)."""
+        staged, self._staged = self._staged, []
+        return self._drop(staged)
+
+    def add(
+        self,
+        title: str,
+        snippet: Optional[str],
+        published_at: Optional[datetime],
+        dedupe_group_id: str,
+        canonical_id: Optional[str] = None,
+        teams: Optional[List[str]] = None,
+    ) -> None:
+        """Index an already-clustered story (e.g. a row loaded from the DB)."""
+        sh = shingles(title, snippet)
+        story = _Story(
+            sh,
+            frozenset(teams or ()),
+            published_at,
+            dedupe_group_id,
+            canonical_id or make_canonical_id(dedupe_group_id),
+        )
+        self._index(story, self.hasher.signature(sh))
+
+    def load_recent(self, db: Session, now: Optional[datetime] = None) -> int:
+        """Warm the index with the last window of content_items (one streamed query)."""
+        since = (now or _utc_now()) - self.window
+        rows = db.execute(
+            sa.select(
+                ContentItem.title,
+                ContentItem.snippet,
+                ContentItem.published_at,
+                ContentItem.dedupe_group_id,
+                ContentItem.canonical_id,
+                ContentItem.teams,
+            )
+            .where(ContentItem.published_at >= since, ContentItem.dedupe_group_id.is_not(None))
+            .order_by(ContentItem.published_at)
+            .execution_options(yield_per=2000)
+        )
+        n = 0
+        for title, snippet, published_at, group_id, canonical_id, teams in rows:
+            self.add(title, snippet, published_at, group_id, canonical_id, teams)
+            n += 1
+        return n
+
+    # ----------------------------
+    # matching
+    # ----------------------------
+    def _best_match(
+        self, sh: FrozenSet[str], teams: FrozenSet[str], sig: Signature, published_at: Optional[datetime]
+    ) -> Tuple[Optional[_Story], float]:
+        best, best_sim = None, 0.0
+        seen = set()
+        for key in self._bucket_keys(sig):
+            for story in self.buckets.get(key, ()):
+                if id(story) in seen:
+                    continue
+                seen.add(id(story))
+                if (
+                    published_at is not None
+                    and story.published_at is not None
+                    and abs(published_at - story.published_at) > self.window
+                ):
+                    continue
+                if not teams_compatible(teams, story.teams):
+                    continue
+                sim = jaccard(sh, story.shingles)
+                if sim >= self.threshold and sim > best_sim:
+                    best, best_sim = story, sim
+        return best, best_sim
+
+    def assign(
+        self,
+        title: str,
+        snippet: Optional[str],
+        published_at: Optional[datetime],
+        teams: Optional[List[str]] = None,
+        key: Optional[str] = None,
+    ) -> ClusterMatch:
+        """Cluster a new story against the window, then stage it under the chosen cluster (key = its url)."""
+        sh = shingles(title, snippet)
+        team_set = frozenset(teams or ())
+        sig = self.hasher.signature(sh)
+
+        match, sim = (None, 0.0) if sig is None else self._best_match(sh, team_set, sig, published_at)
+        if match is not None:
+            result = ClusterMatch(match.dedupe_group_id, match.canonical_id, True, sim)
+        else:
+            group_id = make_dedupe_group_id(title, teams=teams)
+            result = ClusterMatch(group_id, make_canonical_id(group_id), False)
+
+        story = _Story(sh, team_set, published_at, result.dedupe_group_id, result.canonical_id, key=key)
+        self._index(story, sig)
+        self._staged.append(story)
+        return result
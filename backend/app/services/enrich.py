@@ -4,7 +4,7 @@ import hashlib
 import re
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 from app.services.team_aliases import TEAM_ALIASES
 
 PUNCT_RE = re.compile(r"[^a-z0-9\s]")
@@ -18,6 +18,28 @@ TOPIC_RULES = {
     "suspension": [r"\bsuspend", r"\bfined\b", r"\bdiscipline\b"],
 }
 
+# Order matters: more specific first
+SPORT_RULES = [
+    ("cfb", [r"\bcollege football\b", r"\bncaa football\b", r"\bncaaf\b", r"\bcfb\b", r"\bbowl\b", r"\bsec\b", r"\bbig ten\b", r"\bacc\b", r"\bbig 12\b", r"\bpac-?12\b"]),
+    ("nfl", [r"\bnfl\b", r"\bsuper bowl\b", r"\bplayoffs\b", r"\bquarterback\b", r"\btouchdown\b", r"\bqb\b", r"\bafc\b", r"\bnfc\b"]),
+    ("nba", [r"\bnba\b", r"\bplayoffs\b", r"\bfinals\b", r"\btrade deadline\b", r"\ball-?star\b", r"\b3-?pointer\b"]),
+    ("nhl", [r"\bnhl\b", r"\bstanley cup\b", r"\bpower play\b", r"\bgoalie\b", r"\bpuck\b"]),
+    ("mlb", [r"\bmlb\b", r"\bhome run\b", r"\bpitcher\b", r"\binnings?\b", r"\bworld series\b", r"\bspring training\b"]),
+    ("f1",  [r"\bformula 1\b", r"\bf1\b", r"\bgrand prix\b", r"\bqualifying\b", r"\bpole\b", r"\bpaddock\b"]),
+    ("nascar", [r"\bnascar\b", r"\bdaytona\b", r"\b(indycar|indy car)\b", r"\btrack\b", r"\bpit road\b"]),
+]
+
+# Team/league token hints help disambiguate
+URL_HINTS = {
+    "nba": ["/nba", "nba."],
+    "nfl": ["/nfl", "nfl."],
+    "cfb": ["/college-football", "/ncf", "ncaaf", "collegefootball"],
+    "mlb": ["/mlb", "mlb."],
+    "nhl": ["/nhl", "nhl."],
+    "f1": ["/f1", "formula1", "f1."],
+    "nascar": ["/nascar", "nascar."],
+}
+
 # Start simple. You can expand this later.
 # backend/app/services/team_aliases.py
 TEAM_ALIASES = {k.lower(): v.upper() for k, v in TEAM_ALIASES.items()}
@@ -50,23 +72,38 @@ def make_canonical_id(dedupe_group_id: str) -> str:
 
 def classify_topics(title: str, summary: str = "") -> List[str]:
     text = f"{title} {summary}".lower()
-    topics: List[str] = []
-    for topic, patterns in TOPIC_RULES.items():
-        for p in patterns:
-            if re.search(p, text):
-                topics.append(topic)
-                break
-    return topics
+    return [topic for topic, rx in RULES.topic_res if rx.search(text)]
+
+
+def classify_sport(title: str, snippet: Optional[str], url: Optional[str]) -> Optional[str]:
+    rules = RULES
+    text = f"{title or ''} {snippet or ''}".lower()
+
+    # URL hints first (fast + often accurate)
+    if url:
+        u = url.lower()
+        for sport, hints in rules.url_hints:
+            if any(h in u for h in hints):
+                return sport
+
+    # Keyword rules
+    for sport, rx in rules.sport_res:
+        if rx.search(text):
+            return sport
+
+    return None
 
 
 import html
 import re
 from typing import List, Optional
 
-# Optional: precompile alias patterns once for speed (recommended)
-# Build this once at import time.
+# Alias matching uses a token trie built once at import time (see _build_alias_trie).
 # TEAM_ALIASES: Dict[str, str]  # alias -> code (e.g., "los angeles lakers" -> "LAL")
 
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+
+
 def _normalize_for_team_match(s: str) -> str:
     if not s:
         return ""
@@ -82,68 +119,125 @@ def _normalize_for_team_match(s: str) -> str:
 
     # URLs: treat separators as spaces so slug tokens become matchable
     # keep alphanumerics, replace everything else with spaces
-    s = re.sub(r"[^a-z0-9]+", " ", s)
+    s = _NON_ALNUM_RE.sub(" ", s)
 
     # collapse whitespace
-    s = re.sub(r"\s+", " ", s).strip()
-    return s
+    return " ".join(s.split())
+
+
+_TRIE_END = ""  # never a real token (tokens are non-empty [a-z0-9]+ runs)
 
 
-def _alias_to_pattern(alias: str) -> re.Pattern:
+def _build_alias_trie(aliases: Dict[str, str]) -> Dict[str, Any]:
     """
-    Convert an alias like "l.a. lakers" or "san-francisco 49ers" into a robust regex
-    that matches regardless of punctuation/spacing (since we normalize to spaces).
+    Token trie over the normalized aliases, e.g. "san francisco 49ers" ->
+    trie["san"]["francisco"]["49ers"][_TRIE_END] = [alias index, ...].
+
+    Normalized text is just [a-z0-9]+ tokens joined by single spaces, so matching
+    whole token sequences is exactly the old r"\bsan\s+francisco\s+49ers\b" regex.
+    The alias index (TEAM_ALIASES insertion order) is kept so results come back
+    in the same order the per-alias regex loop produced them.
     """
-    a = _normalize_for_team_match(alias)
-
-    # Turn spaces into flexible whitespace
-    # Example: "san francisco 49ers" -> r"\bsan\s+francisco\s+49ers\b"
-    parts = [re.escape(p) for p in a.split() if p]
-    if not parts:
-        # should never happen, but avoid crashing
-        return re.compile(r"$^")
-    pat = r"\b" + r"\s+".join(parts) + r"\b"
-    return re.compile(pat)
-
-
-# Precompile patterns once (do this at module load)
-# NOTE: order matters; we preserve insertion order of TEAM_ALIASES
-_TEAM_PATTERNS: List[tuple[re.Pattern, str]] = [
-    (_alias_to_pattern(alias), abbr) for alias, abbr in TEAM_ALIASES.items()
-]
+    root: Dict[str, Any] = {}
+    for idx, alias in enumerate(aliases):
+        parts = _normalize_for_team_match(alias).split()
+        if not parts:
+            continue
+        node = root
+        for part in parts:
+            node = node.setdefault(part, {})
+        node.setdefault(_TRIE_END, []).append(idx)
+    return root
+
+
+def _match_aliases(tokens: List[str], trie: Dict[str, Any]) -> List[int]:
+    """Single left-to-right pass; returns matched alias indexes, sorted."""
+    hits = set()
+    n = len(tokens)
+    for i in range(n):
+        node = trie.get(tokens[i])
+        j = i + 1
+        while node is not None:
+            ends = node.get(_TRIE_END)
+            if ends:
+                hits.update(ends)
+            if j >= n:
+                break
+            node = node.get(tokens[j])
+            j += 1
+    return sorted(hits)
+
+
+def _alternation(name: str, patterns: List[str]) -> re.Pattern:
+    """All of one topic's/sport's rules as a single regex: (?P<name>p1|p2|...)."""
+    return re.compile(f"(?P<{name}>" + "|".join(f"(?:{p})" for p in patterns) + ")")
+
+
+@dataclass(frozen=True)
+class EnrichmentRules:
+    """
+    Everything the enrichment hot path needs, compiled once.
+
+    Topics/sports get one alternation regex each (rather than one big regex for
+    all of them) because a topic only needs *some* rule to hit, and a shared
+    alternation would let one topic's match hide another's at the same spot.
+    """
+
+    team_trie: Dict[str, Any]
+    team_codes: List[str]  # alias index -> team code
+    valid_codes: FrozenSet[str]
+    topic_res: List[Tuple[str, re.Pattern]]
+    sport_res: List[Tuple[str, re.Pattern]]
+    url_hints: List[Tuple[str, Tuple[str, ...]]]
+
+
+def build_rules() -> EnrichmentRules:
+    # NOTE: order matters; we preserve insertion order of TEAM_ALIASES / TOPIC_RULES / SPORT_RULES
+    return EnrichmentRules(
+        team_trie=_build_alias_trie(TEAM_ALIASES),
+        team_codes=list(TEAM_ALIASES.values()),
+        valid_codes=frozenset(TEAM_ALIASES.values()),
+        topic_res=[(topic, _alternation(topic, pats)) for topic, pats in TOPIC_RULES.items()],
+        sport_res=[(sport, _alternation(sport, pats)) for sport, pats in SPORT_RULES],
+        url_hints=[(sport, tuple(hints)) for sport, hints in URL_HINTS.items()],
+    )
+
+
+RULES: EnrichmentRules = build_rules()
+
+
+def reload_rules() -> EnrichmentRules:
+    """Rebuild RULES after editing TEAM_ALIASES / TOPIC_RULES / SPORT_RULES at runtime."""
+    global RULES
+    RULES = build_rules()
+    return RULES
 
 
 def extract_teams(title: str, summary: str = "", url: Optional[str] = None) -> List[str]:
+    rules = RULES
+
     # Combine text sources
     combined = f"{title or ''} {summary or ''} {url or ''}"
     text = _normalize_for_team_match(combined)
+    tokens = text.split()
 
-    found: List[str] = []
+    # dict keys = ordered set; deduplicates while preserving first-seen order
+    found: Dict[str, None] = {}
 
     # 1) Alias/name/nickname detection (most reliable)
-    for pat, abbr in _TEAM_PATTERNS:
-        if pat.search(text):
-            found.append(abbr)
+    for idx in _match_aliases(tokens, rules.team_trie):
+        found[rules.team_codes[idx]] = None
 
     # 2) Direct code detection fallback (helps when feeds include abbreviations)
     # Only add codes that exist anywhere in TEAM_ALIASES values (avoid random 3-letter words)
-    valid_codes = set(TEAM_ALIASES.values())
-
     # After normalization, codes appear as tokens (e.g., "sf", "lal")
-    # We'll scan original (not stripped of caps) by using normalized text and uppercase.
-    for token in text.split():
+    for token in tokens:
         if len(token) in (2, 3, 4):  # KC, SF, LAL, etc.
             code = token.upper()
-            if code in valid_codes:
-                found.append(code)
-
-    # Deduplicate preserving order
-    out: List[str] = []
-    for t in found:
-        if t not in out:
-            out.append(t)
+            if code in rules.valid_codes:
+                found[code] = None
 
-    return out
+    return list(found)
 
 
 
@@ -156,36 +250,98 @@ def source_tier(source: str) -> int:
     return 3
 
 
-def compute_urgency(published_at: Optional[datetime], topics: List[str]) -> float:
+# Version of the topic / tier / urgency / rank rules below (and TOPIC_RULES above), stored on
+# every row as content_items.enrich_version. Bump it when changing any of them, then run
+# `python -m app.scripts.reenrich` to recompute the rows written under an older version.
+ENRICH_VERSION = 1
+
+TOPIC_URGENCY_BUMPS = {"injury": 0.15, "trade": 0.15, "suspension": 0.10}
+MAX_URGENCY_BUMP = sum(TOPIC_URGENCY_BUMPS.values())
+
+TIER_BONUS = {1: 0.25, 2: 0.10, 3: 0.0}
+URGENCY_WEIGHT = 0.6
+DUPLICATE_PENALTY = 0.35
+
+# Hours for the recency terms to fade out
+RANK_RECENCY_HOURS = 48.0
+URGENCY_RECENCY_HOURS = 24.0
+
+# Live rank loses this much per hour of age (rank recency + weighted urgency recency)
+RANK_DECAY_PER_HOUR = 1.0 / RANK_RECENCY_HOURS + URGENCY_WEIGHT / URGENCY_RECENCY_HOURS
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def topic_urgency_bump(topics: List[str]) -> float:
+    return sum(bump for topic, bump in TOPIC_URGENCY_BUMPS.items() if topic in topics)
+
+
+def epoch_hours(dt: datetime) -> float:
+    # naive UTC -> hours since epoch; same value as extract(epoch from published_at) / 3600 in Postgres
+    return (dt - _EPOCH).total_seconds() / 3600.0
+
+
+def compute_urgency(published_at: Optional[datetime], topics: List[str], now: Optional[datetime] = None) -> float:
     if not published_at:
         return 0.0
-    now = _utc_now()
-    age_hours = max(0.0, (now - published_at).total_seconds() / 3600.0)
-    recency = max(0.0, 1.0 - (age_hours / 24.0))  # fades over 24h
+    return live_urgency(published_at, topic_urgency_bump(topics), now)
 
-    bump = 0.0
-    if "injury" in topics:
-        bump += 0.15
-    if "trade" in topics:
-        bump += 0.15
-    if "suspension" in topics:
-        bump += 0.10
 
-    return min(1.0, recency + bump)
+def live_urgency(published_at: Optional[datetime], urgency_bump: float, now: Optional[datetime] = None) -> float:
+    if not published_at:
+        return 0.0
+    now = now or _utc_now()
+    age_hours = max(0.0, (now - published_at).total_seconds() / 3600.0)
+    recency = max(0.0, 1.0 - (age_hours / URGENCY_RECENCY_HOURS))  # fades over 24h
+    return min(1.0, recency + (urgency_bump or 0.0))
 
 
-def compute_rank_score(published_at: Optional[datetime], tier: int, urgency: float, is_duplicate: bool) -> float:
-    now = _utc_now()
+def compute_rank_score(
+    published_at: Optional[datetime], tier: int, urgency: float, is_duplicate: bool, now: Optional[datetime] = None
+) -> float:
+    now = now or _utc_now()
     if not published_at:
         rec = 0.0
     else:
         age_hours = max(0.0, (now - published_at).total_seconds() / 3600.0)
-        rec = max(0.0, 1.0 - (age_hours / 48.0))  # fades over 48h
+        rec = max(0.0, 1.0 - (age_hours / RANK_RECENCY_HOURS))  # fades over 48h
+
+    tier_bonus = TIER_BONUS.get(tier, 0.0)
+    dup_penalty = DUPLICATE_PENALTY if is_duplicate else 0.0
+
+    return float(rec + tier_bonus + (urgency * URGENCY_WEIGHT) - dup_penalty)
+
+
+# ----------------------------
+# Query-time ranking
+# ----------------------------
+# compute_rank_score() above is a snapshot: it is only right at the moment it was computed.
+# For sorting we split rank into a static part and a linear time decay:
+#
+#     live_rank(now) = rank_base - RANK_DECAY_PER_HOUR * age_hours
+#                    = rank_key  - RANK_DECAY_PER_HOUR * epoch_hours(now)
+#     rank_key       = rank_base + RANK_DECAY_PER_HOUR * epoch_hours(published_at)
+#
+# The `now` term is the same for every row, so ORDER BY rank_key DESC is ORDER BY live rank
+# at any point in time, off a plain btree index and without ever rewriting rows.
+# rank_base is what a just-published item would score (both recency terms at 1.0);
+# topic bumps count as extra urgency instead of being absorbed by the min(1.0, ...) clamp.
+
+def compute_rank_base(tier: Optional[int], topics: List[str], is_duplicate: bool) -> float:
+    tier_bonus = TIER_BONUS.get(tier or 0, 0.0)
+    dup_penalty = DUPLICATE_PENALTY if is_duplicate else 0.0
+    urgency = 1.0 + topic_urgency_bump(topics)
+    return float(1.0 + tier_bonus + urgency * URGENCY_WEIGHT - dup_penalty)
+
+
+def compute_rank_key(rank_base: float, published_at: datetime) -> float:
+    return float(rank_base + RANK_DECAY_PER_HOUR * epoch_hours(published_at))
 
-    tier_bonus = {1: 0.25, 2: 0.10, 3: 0.0}.get(tier, 0.0)
-    dup_penalty = 0.35 if is_duplicate else 0.0
 
-    return float(rec + tier_bonus + (urgency * 0.6) - dup_penalty)
+def live_rank_score(rank_key: Optional[float], now: Optional[datetime] = None) -> Optional[float]:
+    if rank_key is None:
+        return None
+    return float(rank_key - RANK_DECAY_PER_HOUR * epoch_hours(now or _utc_now()))
 
 
 def build_entities(teams: List[str], players: Optional[List[str]] = None, leagues: Optional[List[str]] = None) -> Dict[str, Any]:
@@ -0,0 +1,158 @@
+"""
+CPU-bound enrichment stage of the ingest pipeline.
+
+enrich_entry() is the pure per-entry step: quality gate, normalization, sport inference,
+team/topic extraction, tier and urgency. It takes and returns plain tuples/dicts, so the
+same function runs inline (serial path) or in worker processes (EnrichmentPool) and gives
+identical rows either way; `now` is passed in so urgency doesn't depend on which process
+ran the entry.
+
+Anything that needs shared state stays on the writer thread in ingest_response:
+near-duplicate clustering (StoryClusterer), is_duplicate and the rank fields.
+
+Workers compile their own enrichment rules at import; reload_rules() in the parent does
+not reach an already-running pool.
+"""
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.services.enrich import (
+    ENRICH_VERSION,
+    build_entities,
+    classify_sport,
+    classify_topics,
+    compute_urgency,
+    extract_teams,
+    source_tier,
+    topic_urgency_bump,
+)
+from app.services.quality import normalize_snippet, normalize_title, quality_gate
+from app.settings import settings
+
+# (url, title, published_at, snippet) as pulled off the feed
+Entry = Tuple[str, str, datetime, str]
+
+
+def enrich_entry(entry: Entry, source: str, sport: str, now: datetime) -> Optional[Dict[str, Any]]:
+    """Row dict for one feed entry (without cluster / rank fields), or None if the quality gate drops it."""
+    url, title, published_at, snippet = entry
+
+    effective_sport = sport
+    if sport in ("general", "top"):
+        inferred = classify_sport(title, snippet, url)
+        if inferred:
+            effective_sport = inferred
+
+    # ----------------------------
+    # Quality gate (Phase 3.3)
+    # ----------------------------
+    decision = quality_gate(title=title, url=url, snippet=snippet)
+    if not decision.ok:
+        # Optional: uncomment for debugging drops
+        # print(f"[DROP] reason={decision.reason} source={source} title={title[:80]!r}")
+        return None
+
+    # Normalize text before enrichment + storage
+    title = normalize_title(title)
+    snippet = normalize_snippet(snippet) or ""
+
+    # ----------------------------
+    # Enrichment
+    # ----------------------------
+    summary_text = (snippet or "").strip()
+
+    teams = extract_teams(title, summary_text, url=url)
+    teams = [t.upper() for t in teams]
+    topics = classify_topics(title, summary_text)
+
+    tier = source_tier(source)
+    urgency = compute_urgency(published_at, topics, now=now)
+
+    entities = build_entities(
+        teams=teams,
+        players=[],
+        leagues=[effective_sport] if effective_sport else [],
+    )
+
+    return dict(
+        source=source,
+        sport=effective_sport,
+        teams=teams,
+        title=title[:300],
+        url=url[:600],
+        published_at=published_at,
+        snippet=snippet,
+        topics=topics,
+        urgency=urgency,
+        urgency_bump=topic_urgency_bump(topics),
+        sentiment=None,
+        entities=entities,
+        summary=summary_text[:800] if summary_text else None,
+        key_points=None,
+        confidence=0.6,  # MVP constant (we can improve later)
+        source_tier=tier,
+        enrich_version=ENRICH_VERSION,
+    )
+
+
+def enrich_chunk(
+    entries: Sequence[Entry], source: str, sport: str, now: datetime
+) -> List[Optional[Dict[str, Any]]]:
+    return [enrich_entry(e, source, sport, now) for e in entries]
+
+
+class EnrichmentPool:
+    """
+    Fans entries out to a ProcessPoolExecutor in chunks of `chunk_size`; results come
+    back in input order. workers <= 1 runs inline (no processes are started).
+    Use one pool per ingest run: `with EnrichmentPool(workers) as pool: ...`.
+    The backfill engine (services/backfill.py) drives it through submit().
+    """
+
+    def __init__(self, workers: Optional[int] = None, chunk_size: Optional[int] = None):
+        self.workers = settings.INGEST_ENRICH_WORKERS if workers is None else workers
+        self.chunk_size = chunk_size or settings.INGEST_ENRICH_CHUNK_SIZE
+        self.executor: Optional[ProcessPoolExecutor] = (
+            ProcessPoolExecutor(max_workers=self.workers) if self.workers > 1 else None
+        )
+
+    def __enter__(self) -> "EnrichmentPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
+
+    def submit(self, fn: Callable[..., List[Any]], items: Sequence[Any], *args: Any) -> Callable[[], List[Any]]:
+        """
+        Start `fn(chunk, *args)` for every chunk of `items` and return a callable that
+        collects the concatenated results (in input order). `fn` must be a module-level
+        function returning one result per item. Inline pools compute right away.
+        """
+        # a single chunk isn't worth the pickling round trip
+        if self.executor is None or len(items) <= self.chunk_size:
+            result = fn(items, *args)
+            return lambda: result
+
+        chunks = [items[i:i + self.chunk_size] for i in range(0, len(items), self.chunk_size)]
+        futures = [self.executor.submit(fn, chunk, *args) for chunk in chunks]
+
+        def collect() -> List[Any]:
+            out: List[Any] = []
+            for f in futures:
+                out.extend(f.result())
+            return out
+
+        return collect
+
+    def enrich(
+        self, entries: Sequence[Entry], source: str, sport: str, now: datetime
+    ) -> List[Optional[Dict[str, Any]]]:
+        return self.submit(enrich_chunk, entries, source, sport, now)()
@@ -0,0 +1,57 @@
+"""
+SQL side of query-time ranking (see the "Query-time ranking" notes in enrich.py).
+
+Everything time-dependent is evaluated against a `now` passed in by the caller,
+so one request uses one clock for filtering, ordering and the card values.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import sqlalchemy as sa
+from sqlalchemy import func
+
+from app.services.enrich import (
+    MAX_URGENCY_BUMP,
+    RANK_DECAY_PER_HOUR,
+    URGENCY_RECENCY_HOURS,
+    epoch_hours,
+)
+
+
+def rank_order(model):
+    """
+    Best-first ordering by live rank, then recency; id makes it a total order for keyset paging
+    (served by ix_content_items_rank_keyset).
+    """
+    return (model.rank_key.desc(), model.published_at.desc(), model.id.desc())
+
+
+def rank_keyset_columns(model):
+    return (model.rank_key, model.published_at, model.id)
+
+
+def min_live_rank_filter(model, min_rank_score: float, now: datetime):
+    # live_rank >= x  <=>  rank_key >= x + decay * epoch_hours(now)   (sargable on rank_key)
+    return model.rank_key >= min_rank_score + RANK_DECAY_PER_HOUR * epoch_hours(now)
+
+
+def live_urgency_expr(model, now: datetime):
+    age_hours = func.extract("epoch", sa.literal(now, sa.DateTime) - model.published_at) / 3600.0
+    recency = func.greatest(0.0, 1.0 - age_hours / URGENCY_RECENCY_HOURS)
+    return func.least(1.0, recency + func.coalesce(model.urgency_bump, 0.0))
+
+
+def min_live_urgency_filter(model, min_urgency: float, now: datetime):
+    """
+    live urgency >= min_urgency.
+    live urgency = min(1, recency + urgency_bump) with urgency_bump <= MAX_URGENCY_BUMP, so a
+    row whose bump alone reaches min_urgency qualifies at any age. Only above MAX_URGENCY_BUMP
+    does a threshold need recency: then no row older than 24h * (1 + MAX_URGENCY_BUMP - min_urgency)
+    can qualify, and that bound goes first as a published_at range the btree index can use.
+    """
+    urgency = live_urgency_expr(model, now) >= min_urgency
+    if min_urgency <= MAX_URGENCY_BUMP:
+        return urgency
+    window_hours = URGENCY_RECENCY_HOURS * (1.0 + MAX_URGENCY_BUMP - min_urgency)
+    return sa.and_(model.published_at >= now - timedelta(hours=window_hours), urgency)
@@ -1,75 +1,122 @@
 import feedparser
+import hashlib
 import httpx
+from dataclasses import dataclass
 from dateutil import parser as dtparser
-from datetime import timezone
+from datetime import datetime, timezone
+import sqlalchemy as sa
 from sqlalchemy.orm import Session
-from ..models import ContentItem
-import re
-from typing import Optional
-from app.services.quality import quality_gate, normalize_title, normalize_snippet
+from ..db import any_of
+from ..models import ContentItem, FeedCache
+from typing import Any, Dict, Iterable, List, Optional, Set
+from app.cache import bump_generation
+from app.services.content_writer import ContentWriter
+from app.services.dedupe import StoryClusterer
+from app.services.enrich_stage import EnrichmentPool
 
 from app.services.enrich import (
-    classify_topics,
+    _utc_now,
+    compute_rank_base,
+    compute_rank_key,
     compute_rank_score,
-    compute_urgency,
-    extract_teams,
-    make_canonical_id,
-    make_dedupe_group_id,
-    source_tier,
-    build_entities,
 )
 
-# Order matters: more specific first
-SPORT_RULES = [
-    ("cfb", [r"\bcollege football\b", r"\bncaa football\b", r"\bncaaf\b", r"\bcfb\b", r"\bbowl\b", r"\bsec\b", r"\bbig ten\b", r"\bacc\b", r"\bbig 12\b", r"\bpac-?12\b"]),
-    ("nfl", [r"\bnfl\b", r"\bsuper bowl\b", r"\bplayoffs\b", r"\bquarterback\b", r"\btouchdown\b", r"\bqb\b", r"\bafc\b", r"\bnfc\b"]),
-    ("nba", [r"\bnba\b", r"\bplayoffs\b", r"\bfinals\b", r"\btrade deadline\b", r"\ball-?star\b", r"\b3-?pointer\b"]),
-    ("nhl", [r"\bnhl\b", r"\bstanley cup\b", r"\bpower play\b", r"\bgoalie\b", r"\bpuck\b"]),
-    ("mlb", [r"\bmlb\b", r"\bhome run\b", r"\bpitcher\b", r"\binnings?\b", r"\bworld series\b", r"\bspring training\b"]),
-    ("f1",  [r"\bformula 1\b", r"\bf1\b", r"\bgrand prix\b", r"\bqualifying\b", r"\bpole\b", r"\bpaddock\b"]),
-    ("nascar", [r"\bnascar\b", r"\bdaytona\b", r"\b(indycar|indy car)\b", r"\btrack\b", r"\bpit road\b"]),
-]
-
-# Team/league token hints help disambiguate
-URL_HINTS = {
-    "nba": ["/nba", "nba."],
-    "nfl": ["/nfl", "nfl."],
-    "cfb": ["/college-football", "/ncf", "ncaaf", "collegefootball"],
-    "mlb": ["/mlb", "mlb."],
-    "nhl": ["/nhl", "nhl."],
-    "f1": ["/f1", "formula1", "f1."],
-    "nascar": ["/nascar", "nascar."],
+# Common US zone abbreviations seen in RSS pubDate values
+TZINFOS = {
+    "EST": -5 * 3600,
+    "EDT": -4 * 3600,
+    "CST": -6 * 3600,
+    "CDT": -5 * 3600,
+    "MST": -7 * 3600,
+    "MDT": -6 * 3600,
+    "PST": -8 * 3600,
+    "PDT": -7 * 3600,
 }
 
-def classify_sport(title: str, snippet: Optional[str], url: Optional[str]) -> Optional[str]:
-    text = f"{title or ''} {snippet or ''}".lower()
 
-    # URL hints first (fast + often accurate)
-    if url:
-        u = url.lower()
-        for sport, hints in URL_HINTS.items():
-            if any(h in u for h in hints):
-                return sport
+FEED_HEADERS = {
+    "User-Agent": "SportLyticsBot/1.0 (RSS aggregator; contact: you@example.com)",
+    "Accept": "application/rss+xml, application/xml;q=0.9, text/xml;q=0.8, */*;q=0.1",
+    "Accept-Encoding": "identity",
+}
+
+FEED_TIMEOUT = 20
+
+# serial enrichment when the caller doesn't pass a pool (starts no processes)
+_INLINE_POOL = EnrichmentPool(workers=0)
+
+
+@dataclass
+class FeedResult:
+    inserted: int = 0
+    not_modified: bool = False  # server answered 304
+    unchanged: bool = False  # 200, but the body hash matches the last parsed body
+
+
+@dataclass(frozen=True)
+class FeedValidators:
+    """
+    Plain copy of a feed_cache row's validators. Unlike the FeedCache row it can be read
+    from any thread: a committed Session expires its rows, and reading one again would
+    refresh it through the Session.
+    """
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    body_hash: Optional[str] = None
+
+    @classmethod
+    def of(cls, cache: Optional[FeedCache]) -> Optional["FeedValidators"]:
+        if cache is None:
+            return None
+        return cls(etag=cache.etag, last_modified=cache.last_modified, body_hash=cache.body_hash)
 
-    # Keyword rules
-    for sport, patterns in SPORT_RULES:
-        if any(re.search(p, text) for p in patterns):
-            return sport
 
-    return None
+def load_feed_validators(db: Session, urls: Iterable[str]) -> Dict[str, FeedValidators]:
+    urls = list(urls)
+    if not urls:
+        return {}
+    rows = db.execute(
+        sa.select(FeedCache.url, FeedCache.etag, FeedCache.last_modified, FeedCache.body_hash)
+        .where(FeedCache.url == any_of(urls))
+    )
+    return {url: FeedValidators(etag, last_modified, body_hash) for url, etag, last_modified, body_hash in rows}
 
 
-def ingest_feed(db: Session, feed_url: str, source: str, sport: str):
-    headers = {
-        "User-Agent": "SportLyticsBot/1.0 (RSS aggregator; contact: you@example.com)",
-        "Accept": "application/rss+xml, application/xml;q=0.9, text/xml;q=0.8, */*;q=0.1",
-        "Accept-Encoding": "identity",
-    }
+def conditional_headers(validators: Optional[FeedValidators]) -> Dict[str, str]:
+    headers: Dict[str, str] = {}
+    if validators is None:
+        return headers
+    if validators.etag:
+        headers["If-None-Match"] = validators.etag
+    if validators.last_modified:
+        headers["If-Modified-Since"] = validators.last_modified
+    return headers
 
-    with httpx.Client(follow_redirects=True, timeout=20, headers=headers) as client:
-        resp = client.get(feed_url)
+
+def _body_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def fetch_feed(client: httpx.Client, feed_url: str, validators: Optional[FeedValidators] = None) -> httpx.Response:
+    resp = client.get(feed_url, headers=conditional_headers(validators))
+    if resp.status_code != 304:
         resp.raise_for_status()
-        parsed = feedparser.parse(resp.content)  # ✅ bytes, not resp.text
+    return resp
+
+
+async def fetch_feed_async(
+    client: httpx.AsyncClient,
+    feed_url: str,
+    validators: Optional[FeedValidators] = None,
+) -> httpx.Response:
+    resp = await client.get(feed_url, headers=conditional_headers(validators))
+    if resp.status_code != 304:
+        resp.raise_for_status()
+    return resp
+
+
+def parse_feed(resp: httpx.Response, feed_url: str, source: str, sport: str):
+    parsed = feedparser.parse(resp.content)  # ✅ bytes, not resp.text
 
     if "nbcsports" in feed_url:
         print("[NBC DEBUG] status=", resp.status_code, "content-type=", resp.headers.get("content-type"))
@@ -79,8 +126,128 @@ def ingest_feed(db: Session, feed_url: str, source: str, sport: str):
         print(f"[RSS PARSE WARNING] source={source} sport={sport} url={feed_url}")
         print(f"  bozo_exception={getattr(parsed, 'bozo_exception', None)}")
     print(f"[RSS] source={source} sport={sport} entries={len(getattr(parsed, 'entries', []))} url={feed_url}")
-
-    inserted = 0
+    return parsed
+
+
+def existing_content_urls(db: Session, urls: Iterable[str]) -> Set[str]:
+    urls = list(urls)
+    if not urls:
+        return set()
+    return set(db.execute(sa.select(ContentItem.url).where(ContentItem.url == any_of(urls))).scalars())
+
+
+def existing_dedupe_groups(db: Session, group_ids: Iterable[str]) -> Set[str]:
+    group_ids = list(group_ids)
+    if not group_ids:
+        return set()
+    q = (
+        sa.select(ContentItem.dedupe_group_id)
+        .where(ContentItem.dedupe_group_id == any_of(group_ids))
+        .distinct()
+    )
+    return set(db.execute(q).scalars())
+
+
+def _remember_validators(
+    db: Session,
+    cache: Optional[FeedCache],
+    feed_url: str,
+    resp: httpx.Response,
+    body_hash: Optional[str],
+) -> FeedCache:
+    now = datetime.utcnow()
+    if cache is None:
+        cache = FeedCache(url=feed_url)
+        db.add(cache)
+
+    cache.last_status = resp.status_code
+    cache.checked_at = now
+    if resp.status_code == 304:
+        # 304 may carry refreshed validators; keep the old ones otherwise
+        cache.etag = resp.headers.get("etag") or cache.etag
+        cache.last_modified = resp.headers.get("last-modified") or cache.last_modified
+        return cache
+
+    cache.etag = resp.headers.get("etag")
+    cache.last_modified = resp.headers.get("last-modified")
+    if body_hash != cache.body_hash:
+        cache.body_hash = body_hash
+        cache.changed_at = now
+    return cache
+
+
+def ingest_feed(
+    db: Session,
+    feed_url: str,
+    source: str,
+    sport: str,
+    writer: Optional[ContentWriter] = None,
+    clusterer: Optional[StoryClusterer] = None,
+    pool: Optional[EnrichmentPool] = None,
+) -> FeedResult:
+    cache = db.get(FeedCache, feed_url)
+    with httpx.Client(follow_redirects=True, timeout=FEED_TIMEOUT, headers=FEED_HEADERS) as client:
+        resp = fetch_feed(client, feed_url, FeedValidators.of(cache))
+
+    return ingest_response(
+        db, resp, feed_url, source=source, sport=sport, cache=cache, writer=writer, clusterer=clusterer, pool=pool
+    )
+
+
+def ingest_response(
+    db: Session,
+    resp: httpx.Response,
+    feed_url: str,
+    source: str,
+    sport: str,
+    cache: Optional[FeedCache] = None,
+    writer: Optional[ContentWriter] = None,
+    clusterer: Optional[StoryClusterer] = None,
+    pool: Optional[EnrichmentPool] = None,
+) -> FeedResult:
+    """
+    Parse + enrich + persist a fetched feed body.
+    Shared by the sync path (ingest_feed) and the async engine (run_all_async).
+
+    304s and bodies identical to the last parsed one skip feedparser and enrichment
+    entirely; only the validators are refreshed. Validators are committed together
+    with the inserted rows, so a failed run never marks a feed as already seen.
+
+    Rows go through `writer` (one shared ContentWriter per run, so per-batch
+    inserted/skipped counts end up on the IngestRun); it is flushed before commit.
+
+    Story clustering goes through `clusterer` (one warmed near-duplicate index per run,
+    see dedupe.py); a standalone call warms its own.
+
+    Per-entry enrichment runs through `pool` (enrich_stage.EnrichmentPool, shared per run);
+    without one it runs inline on this thread.
+    """
+    if writer is None:
+        writer = ContentWriter(db)
+
+    if resp.status_code == 304:
+        _remember_validators(db, cache, feed_url, resp, None)
+        db.commit()
+        print(f"[RSS] source={source} sport={sport} not_modified url={feed_url}")
+        return FeedResult(not_modified=True)
+
+    body_hash = _body_hash(resp.content)
+    if cache is not None and cache.body_hash == body_hash:
+        _remember_validators(db, cache, feed_url, resp, body_hash)
+        db.commit()
+        print(f"[RSS] source={source} sport={sport} unchanged url={feed_url}")
+        return FeedResult(unchanged=True)
+
+    parsed = parse_feed(resp, feed_url, source, sport)
+    if clusterer is None:
+        clusterer = StoryClusterer()
+        clusterer.load_recent(db)
+
+    # ----------------------------
+    # 1) Pull usable entries off the feed (one row per URL)
+    # ----------------------------
+    candidates = []
+    seen_urls = set()
     for e in parsed.entries:
         url = getattr(e, "link", None)
         title = getattr(e, "title", None)
@@ -92,17 +259,6 @@ def ingest_feed(db: Session, feed_url: str, source: str, sport: str):
         if not published_raw:
             continue
 
-        TZINFOS = {
-            "EST": -5 * 3600,
-            "EDT": -4 * 3600,
-            "CST": -6 * 3600,
-            "CDT": -5 * 3600,
-            "MST": -7 * 3600,
-            "MDT": -6 * 3600,
-            "PST": -8 * 3600,
-            "PDT": -7 * 3600,
-        }
-
         dt = dtparser.parse(published_raw, tzinfos=TZINFOS)
 
         # normalize to UTC (store UTC in DB)
@@ -112,93 +268,69 @@ def ingest_feed(db: Session, feed_url: str, source: str, sport: str):
 
         snippet = getattr(e, "summary", None) or ""
 
-        # dedupe by url (unique constraint)
-        exists = db.query(ContentItem).filter(ContentItem.url == url).first()
-        if exists:
+        if url[:600] in seen_urls:
             continue
-
-        effective_sport = sport
-        if sport in ("general", "top"):
-            inferred = classify_sport(title, snippet, url)
-            if inferred:
-                effective_sport = inferred
-
-        # ----------------------------
-        # Quality gate (Phase 3.3)
-        # ----------------------------
-        decision = quality_gate(title=title, url=url, snippet=snippet)
-        if not decision.ok:
-            # Optional: uncomment for debugging drops
-            # print(f"[DROP] reason={decision.reason} source={source} title={title[:80]!r}")
+        seen_urls.add(url[:600])
+        candidates.append((url, title, published_at, snippet))
+
+    # dedupe by url (unique constraint): one round trip for the whole feed
+    existing_urls = existing_content_urls(db, seen_urls)
+
+    # ----------------------------
+    # 2) Enrich the new ones (inline, or fanned out to worker processes)
+    # ----------------------------
+    new_entries = [c for c in candidates if c[0][:600] not in existing_urls]
+    enriched = (pool or _INLINE_POOL).enrich(new_entries, source, sport, _utc_now())
+
+    # Near-duplicate clustering needs the shared index, so it runs here in entry order
+    rows = []
+    clustered = []  # per row: matched a story already in the dedupe window
+    for row in enriched:
+        if row is None:
             continue
-
-        # Normalize text before enrichment + storage
-        title = normalize_title(title)
-        snippet = normalize_snippet(snippet) or ""
-
-
-        # ----------------------------
-        # Enrichment + ranking (NEW)
-        # ----------------------------
-        summary_text = (snippet or "").strip()
-
-        teams = extract_teams(title, summary_text, url=url)
-        teams = [t.upper() for t in teams]
-        topics = classify_topics(title, summary_text)
-
-        dedupe_group_id = make_dedupe_group_id(title, teams=teams)
-        canonical_id = make_canonical_id(dedupe_group_id)
-
-        tier = source_tier(source)
-        urgency = compute_urgency(published_at, topics)
-
-        # Duplicate story cluster detection (separate from URL dedupe)
-        existing_cluster = (
-            db.query(ContentItem)
-            .filter(ContentItem.dedupe_group_id == dedupe_group_id)
-            .first()
-        )
-        is_duplicate = existing_cluster is not None
-
-        rank_score = compute_rank_score(published_at, tier, urgency, is_duplicate)
-
-        entities = build_entities(
-            teams=teams,
-            players=[],
-            leagues=[effective_sport] if effective_sport else [],
+        # joins an ESPN/CBS/... story about the same event, if any
+        cluster = clusterer.assign(
+            row["title"], row["summary"] or "", row["published_at"], teams=row["teams"], key=row["url"]
         )
+        row["canonical_id"] = cluster.canonical_id
+        row["dedupe_group_id"] = cluster.dedupe_group_id
+        rows.append(row)
+        clustered.append(cluster.matched)
+
+    # Duplicate story detection (separate from URL dedupe): a near-duplicate match in the window,
+    # or a cluster id that already exists in the table (exact repeats older than the window)
+    existing_groups = existing_dedupe_groups(db, {r["dedupe_group_id"] for r in rows})
+
+    # ----------------------------
+    # 3) Persist: batched INSERT ... ON CONFLICT (url) DO NOTHING
+    # ----------------------------
+    before = writer.inserted
+    for row, matched in zip(rows, clustered):
+        is_duplicate = matched or row["dedupe_group_id"] in existing_groups
+        rank_score = compute_rank_score(row["published_at"], row["source_tier"], row["urgency"], is_duplicate)
+        row["is_duplicate"] = is_duplicate
+        row["rank_score"] = rank_score
+        row["rank_base"] = compute_rank_base(row["source_tier"], row["topics"], is_duplicate)
+        row["rank_key"] = compute_rank_key(row["rank_base"], row["published_at"])
 
         # Debug line so you can SEE it working during ingestion
         print(
-            f"[ENRICH] source={source} sport={effective_sport} dup={is_duplicate} "
-            f"tier={tier} urg={urgency:.2f} rank={rank_score:.2f} "
-            f"topics={topics} teams={teams} title={title[:80]!r}"
+            f"[ENRICH] source={source} sport={row['sport']} dup={is_duplicate} "
+            f"tier={row['source_tier']} urg={row['urgency']:.2f} rank={rank_score:.2f} "
+            f"topics={row['topics']} teams={row['teams']} title={row['title'][:80]!r}"
         )
 
-        db.add(ContentItem(
-            source=source,
-            sport=effective_sport,
-            teams=teams,
-            title=title[:300],
-            url=url[:600],
-            published_at=published_at,
-            snippet=snippet,
-
-            # NEW FIELDS
-            canonical_id=canonical_id,
-            dedupe_group_id=dedupe_group_id,
-            topics=topics,
-            urgency=urgency,
-            sentiment=None,
-            entities=entities,
-            summary=summary_text[:800] if summary_text else None,
-            key_points=None,
-            confidence=0.6,  # MVP constant (we can improve later)
-            source_tier=tier,
-            rank_score=rank_score,
-            is_duplicate=is_duplicate,
-        ))
-        inserted += 1
+        writer.add(row)
+
+    writer.flush()
+    inserted = writer.inserted - before
+    inserted_urls = set(writer.uncommitted_urls)
 
+    _remember_validators(db, cache, feed_url, resp, body_hash)
+    if inserted:
+        bump_generation(db)  # cached API responses are stale from this commit on
     db.commit()
-    return inserted
+    writer.mark_committed()
+    # only stories whose rows are now in the table stay in the dedupe index
+    clusterer.commit_staged(inserted_urls)
+    return FeedResult(inserted=inserted)
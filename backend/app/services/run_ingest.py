@@ -1,5 +1,25 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import httpx
 from sqlalchemy.orm import Session
-from .rss_ingest import ingest_feed
+
+from ..models import FeedCache
+from ..settings import settings
+from .content_writer import ContentWriter
+from .dedupe import StoryClusterer
+from .enrich_stage import EnrichmentPool
+from .rss_ingest import (
+    FEED_HEADERS,
+    FEED_TIMEOUT,
+    FeedResult,
+    fetch_feed_async,
+    ingest_feed,
+    ingest_response,
+    load_feed_validators,
+)
 
 FEEDS = [
     ("ESPN", "nba", "https://www.espn.com/espn/rss/nba/news"),
@@ -30,15 +50,145 @@ FEEDS = [
 ]
 
 
-def run_all(db: Session):
-    total = 0
-    for source, sport, url in FEEDS:
+@dataclass
+class IngestStats:
+    inserted: int = 0
+    not_modified: int = 0
+    unchanged: int = 0
+    skipped: int = 0  # rows dropped by ON CONFLICT at insert time
+    batches: List[Dict[str, Any]] = field(default_factory=list)
+
+    def add(self, result: FeedResult) -> None:
+        self.inserted += result.inserted
+        self.not_modified += int(result.not_modified)
+        self.unchanged += int(result.unchanged)
+
+    def add_writer(self, writer: ContentWriter) -> None:
+        self.skipped += writer.skipped
+        self.batches.extend(b.as_dict() for b in writer.batches)
+
+
+def _log_result(source: str, sport: str, result: FeedResult) -> None:
+    if result.not_modified:
+        print(f"[INGEST] {source} {sport}: not modified (304)")
+    elif result.unchanged:
+        print(f"[INGEST] {source} {sport}: unchanged body")
+    else:
+        print(f"[INGEST] {source} {sport}: inserted={result.inserted}")
+
+
+def _warm_clusterer(db: Session) -> StoryClusterer:
+    """One near-duplicate index per run, loaded with the recent window of stories."""
+    clusterer = StoryClusterer()
+    loaded = clusterer.load_recent(db)
+    print(f"[INGEST] dedupe index warmed with {loaded} recent stories")
+    return clusterer
+
+
+def run_all(db: Session, batch_size: Optional[int] = None, workers: Optional[int] = None) -> IngestStats:
+    stats = IngestStats()
+    writer = ContentWriter(db, batch_size=batch_size or settings.INGEST_BATCH_SIZE)
+    clusterer = _warm_clusterer(db)
+    with EnrichmentPool(workers) as pool:
+        for source, sport, url in FEEDS:
+            try:
+                # Enrichment is applied inside ingest_feed() (rss_ingest.py) when items are upserted.
+                result = ingest_feed(
+                    db, url, source=source, sport=sport, writer=writer, clusterer=clusterer, pool=pool
+                )
+                _log_result(source, sport, result)
+                stats.add(result)
+            except Exception as e:
+                db.rollback()
+                writer.discard_uncommitted()
+                clusterer.discard_staged()
+                print(f"[INGEST ERROR] {source} {sport} url={url} err={e}")
+                continue
+    stats.add_writer(writer)
+    return stats
+
+
+def _ingest_downloaded(
+    db: Session,
+    resp: httpx.Response,
+    url: str,
+    source: str,
+    sport: str,
+    writer: ContentWriter,
+    clusterer: StoryClusterer,
+    pool: EnrichmentPool,
+) -> FeedResult:
+    # Runs on the writer thread, the only thread that uses the Session (and FeedCache rows)
+    return ingest_response(db, resp, url, source, sport, db.get(FeedCache, url), writer, clusterer, pool)
+
+
+async def run_all_async(
+    db: Session,
+    max_connections: Optional[int] = None,
+    per_host: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    workers: Optional[int] = None,
+) -> IngestStats:
+    """
+    Concurrent version of run_all().
+
+    All feeds are fetched at once over a single shared httpx.AsyncClient pool,
+    with at most `per_host` requests in flight per host (ESPN/CBS serve many feeds each).
+    Finished downloads are handed to a single writer that runs parse/enrich/persist
+    in a worker thread, so DB work overlaps with the remaining network I/O while the
+    Session is still only ever used by one thread at a time.
+    """
+    max_connections = max_connections or settings.INGEST_MAX_CONNECTIONS
+    per_host = per_host or settings.INGEST_PER_HOST_CONCURRENCY
+
+    # Validators are copied into plain FeedValidators up front, before any writer work starts:
+    # the fetches never touch FeedCache rows (or the Session), only the writer thread does.
+    validators = load_feed_validators(db, [url for _, _, url in FEEDS])
+
+    writer = ContentWriter(db, batch_size=batch_size or settings.INGEST_BATCH_SIZE)
+    clusterer = _warm_clusterer(db)
+    host_limits: Dict[str, asyncio.Semaphore] = {}
+    done: asyncio.Queue = asyncio.Queue()
+
+    async def fetch(client: httpx.AsyncClient, source: str, sport: str, url: str) -> None:
+        host = urlsplit(url).hostname or ""
+        sem = host_limits.setdefault(host, asyncio.Semaphore(per_host))
+        resp = None
         try:
-            # Enrichment is applied inside ingest_feed() (rss_ingest.py) when items are upserted.
-            inserted = ingest_feed(db, url, source=source, sport=sport)
-            print(f"[INGEST] {source} {sport}: inserted={inserted}")
-            total += inserted
+            async with sem:
+                resp = await fetch_feed_async(client, url, validators.get(url))
         except Exception as e:
             print(f"[INGEST ERROR] {source} {sport} url={url} err={e}")
-            continue
-    return total
+        await done.put((source, sport, url, resp))
+
+    async def write() -> IngestStats:
+        stats = IngestStats()
+        for _ in range(len(FEEDS)):
+            source, sport, url, resp = await done.get()
+            if resp is None:
+                continue
+            try:
+                result = await asyncio.to_thread(
+                    _ingest_downloaded, db, resp, url, source, sport, writer, clusterer, pool
+                )
+                _log_result(source, sport, result)
+                stats.add(result)
+            except Exception as e:
+                db.rollback()
+                writer.discard_uncommitted()
+                clusterer.discard_staged()
+                print(f"[INGEST ERROR] {source} {sport} url={url} err={e}")
+        stats.add_writer(writer)
+        return stats
+
+    limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+    with EnrichmentPool(workers) as pool:
+        async with httpx.AsyncClient(
+            follow_redirects=True,
+            timeout=FEED_TIMEOUT,
+            headers=FEED_HEADERS,
+            limits=limits,
+        ) as client:
+            writer_task = asyncio.create_task(write())
+            await asyncio.gather(*(fetch(client, source, sport, url) for source, sport, url in FEEDS))
+            return await writer_task
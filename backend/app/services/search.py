@@ -0,0 +1,48 @@
+"""
+SQL side of /news?q= search.
+
+Primary mode is Postgres full-text search over the generated `search_tsv` column
+(title weighted A, snippet B, summary C; GIN index ix_content_items_search_tsv),
+parsed with websearch_to_tsquery so users can type "lakers -trade" or quoted phrases.
+
+When full-text finds nothing (misspelled names: "antetokounpo", "mahommes"), search
+falls back to pg_trgm word similarity against the title (GIN index ix_content_items_title_trgm).
+
+Both modes order by a blended score: SEARCH_TEXT_WEIGHT * text relevance + rank_key.
+rank_key differs from the live rank only by a per-request constant (see ranking.py),
+so the blend ranks relevance against live rank without depending on `now`.
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import REGCONFIG
+
+SEARCH_CONFIG = "english"
+
+# ts_rank normalization 32 maps relevance into [0, 1): rank / (rank + 1)
+TS_RANK_NORMALIZATION = 32
+
+# One unit of text relevance is worth this much live rank (about 2 days of decay)
+SEARCH_TEXT_WEIGHT = 2.0
+
+SEARCH_MODES = ("fts", "trgm")
+
+
+def _tsquery(q: str):
+    return func.websearch_to_tsquery(sa.cast(SEARCH_CONFIG, REGCONFIG), q)
+
+
+def search_filter(model, mode: str, q: str):
+    if mode == "fts":
+        return model.search_tsv.bool_op("@@")(_tsquery(q))
+    # title %> q  <=>  word_similarity(q, title) >= pg_trgm.word_similarity_threshold
+    return model.title.bool_op("%>")(q)
+
+
+def search_score(model, mode: str, q: str):
+    if mode == "fts":
+        relevance = func.ts_rank(model.search_tsv, _tsquery(q), TS_RANK_NORMALIZATION)
+    else:
+        relevance = func.word_similarity(q, model.title)
+    return SEARCH_TEXT_WEIGHT * sa.cast(relevance, sa.Float) + model.rank_key
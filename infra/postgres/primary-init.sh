@@ -0,0 +1,11 @@
+#!/bin/bash
+# Runs once, when the primary's data directory is initialized (docker-entrypoint-initdb.d).
+# An existing sportshub_pg volume skips it: `docker compose down -v` (drops local data) or run these by hand.
+set -euo pipefail
+
+psql -v ON_ERROR_STOP=1 --username "$POSTGRES_USER" --dbname "$POSTGRES_DB" <<-'EOSQL'
+    CREATE ROLE replicator WITH REPLICATION LOGIN PASSWORD 'replicator';
+EOSQL
+
+# replication connections need their own pg_hba line ("all" doesn't cover them)
+echo "host replication replicator all scram-sha-256" >> "$PGDATA/pg_hba.conf"
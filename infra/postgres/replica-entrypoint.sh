@@ -0,0 +1,21 @@
+#!/bin/bash
+# Streaming replica: clone the primary with pg_basebackup on first start, then run as a hot standby.
+# -R writes standby.signal + primary_conninfo, so later restarts just resume streaming.
+set -euo pipefail
+
+PGDATA=/var/lib/postgresql/data
+export PGPASSWORD="$REPLICATION_PASSWORD"
+
+mkdir -p "$PGDATA"
+chown postgres:postgres "$PGDATA"
+chmod 700 "$PGDATA"
+
+if [ ! -s "$PGDATA/PG_VERSION" ]; then
+    until gosu postgres pg_basebackup -h "$PRIMARY_HOST" -U "$REPLICATION_USER" -D "$PGDATA" -R -X stream; do
+        echo "waiting for $PRIMARY_HOST to accept replication connections..."
+        rm -rf "${PGDATA:?}"/*
+        sleep 2
+    done
+fi
+
+exec gosu postgres postgres -c hot_standby=on